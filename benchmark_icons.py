@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Script per misurare i tempi e la memoria dei generatori di logo e icone
+"""
+
+import sys
+
+from icon_tools.bench import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+"""
+Script unico per generare logo e icone di tutte le piattaforme
+a partire da icon_manifest.json
+"""
+
+from icon_tools.build import main
+
+if __name__ == "__main__":
+    main()
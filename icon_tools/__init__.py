@@ -0,0 +1,23 @@
+"""
+Moduli condivisi dagli script di generazione delle icone e del logo
+
+Il pacchetto si usa anche come libreria (vedi api.py): importarlo non carica
+Pillow né NumPy, che arrivano solo con il primo render.
+"""
+
+from importlib import import_module
+
+from icon_tools.api import encode_icons, generate, icon_targets, render_assets, render_icons
+
+
+def lazy_exports(module_name, exports):
+    """__getattr__ di modulo (PEP 562) che importa i nomi di exports al primo accesso
+
+    exports associa a ogni nome la coppia (modulo, attributo) da cui prenderlo.
+    """
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        module, attribute = exports[name]
+        return getattr(import_module(module), attribute)
+    return __getattr__
@@ -0,0 +1,100 @@
+"""
+Livelli dell'adaptive icon Android e icone legacy ricavate dagli stessi livelli
+
+Lo sfondo è solo il gradiente, a tutto il canvas da 108dp; il primo piano è
+solo il rombo con la chiave, disegnato nella zona visibile da 72dp al centro
+e circondato da trasparenza. Le icone legacy (quadrata arrotondata e rotonda,
+48dp) sono composte dai livelli già renderizzati invece di essere disegnate
+di nuovo.
+"""
+
+from functools import lru_cache
+
+from PIL import Image
+
+from icon_tools.logo import LOGO_COLORS, LOGO_RADIUS_RATIO, create_diamond_with_key, create_gradient_background
+from icon_tools.masks import apply_rounded_mask
+from icon_tools.profiling import stage
+from icon_tools.resample import resize_image
+
+# Geometria dell'adaptive icon in dp: canvas dei livelli, zona visibile, icona legacy
+ADAPTIVE_CANVAS_DP = 108
+ADAPTIVE_VIEWPORT_DP = 72
+LEGACY_ICON_DP = 48
+
+# Un raggio pari a metà del lato trasforma il quadrato arrotondato in un cerchio
+ROUND_RADIUS_RATIO = 0.5
+
+
+def layer_viewport(layer_size):
+    """Lato e scostamento della zona visibile da 72dp in un livello di layer_size pixel"""
+    viewport = round(layer_size * ADAPTIVE_VIEWPORT_DP / ADAPTIVE_CANVAS_DP)
+    return viewport, (layer_size - viewport) // 2
+
+
+def _hashable(colors):
+    return tuple(tuple(color) for color in colors)
+
+
+@lru_cache(maxsize=16)
+def _cached_layers(size, colors):
+    with stage('adaptive_layers'):
+        background = create_gradient_background(size, size, colors)
+
+        viewport, offset = layer_viewport(size)
+        foreground = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        foreground.paste(create_diamond_with_key(viewport, colors), (offset, offset))
+    return background, foreground
+
+
+def adaptive_layers(size, colors=LOGO_COLORS):
+    """Sfondo (RGB) e primo piano (RGBA) di un'adaptive icon con livelli size x size
+
+    I livelli sono memorizzati per dimensione e colori e condivisi tra i job
+    dello stesso processo: vanno solo letti.
+    """
+    return _cached_layers(size, _hashable(colors))
+
+
+# Le funzioni dei livelli accettano radius_ratio come le altre varianti, ma i
+# livelli non hanno angoli: la maschera la applica il launcher
+def create_adaptive_background(size, colors=LOGO_COLORS, radius_ratio=LOGO_RADIUS_RATIO):
+    """Livello di sfondo dell'adaptive icon: solo il gradiente, a tutto il canvas"""
+    return adaptive_layers(size, colors)[0]
+
+
+def create_adaptive_foreground(size, colors=LOGO_COLORS, radius_ratio=LOGO_RADIUS_RATIO):
+    """Livello di primo piano dell'adaptive icon: il simbolo nella zona visibile, su trasparenza"""
+    return adaptive_layers(size, colors)[1]
+
+
+def legacy_layer_size(size):
+    """Lato in pixel dei livelli dell'adaptive icon da cui si compone un'icona legacy size x size"""
+    return round(size * ADAPTIVE_CANVAS_DP / LEGACY_ICON_DP)
+
+
+def compose_legacy_icon(background, foreground, size, radius_ratio=LOGO_RADIUS_RATIO):
+    """Compone un'icona legacy size x size dai livelli di sfondo e primo piano già renderizzati"""
+    layer_size = background.width
+    with stage('composite'):
+        viewport, offset = layer_viewport(layer_size)
+        box = (offset, offset, offset + viewport, offset + viewport)
+        icon = background.crop(box).convert('RGBA')
+        icon.alpha_composite(foreground.crop(box))
+        if viewport != size:
+            icon = resize_image(icon, size)
+    return apply_rounded_mask(icon, radius_ratio)
+
+
+def create_legacy_icon(size, colors=LOGO_COLORS, radius_ratio=LOGO_RADIUS_RATIO):
+    """Icona legacy size x size composta dai livelli dell'adaptive icon della stessa densità"""
+    background, foreground = adaptive_layers(legacy_layer_size(size), colors)
+    return compose_legacy_icon(background, foreground, size, radius_ratio)
+
+
+def create_round_icon(size, colors=LOGO_COLORS, radius_ratio=LOGO_RADIUS_RATIO):
+    """Icona legacy rotonda (ic_launcher_round) composta dagli stessi livelli
+
+    Il cerchio sostituisce sempre gli angoli arrotondati: radius_ratio è ignorato.
+    """
+    return create_legacy_icon(size, colors, ROUND_RADIUS_RATIO)
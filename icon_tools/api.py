@@ -0,0 +1,137 @@
+"""
+Generazione delle icone da altri strumenti Python (per esempio il wrapper
+della build Flutter), nello stesso processo e senza passare dal disco
+
+Importare questo modulo (o icon_tools) non carica Pillow, NumPy né il codice
+di disegno: vengono importati alla prima chiamata, così gli script a riga di
+comando restano veloci ad avviarsi.
+
+- icon_targets sceglie i target del manifest per piattaforma, dimensione e variante
+- render_icons e encode_icons restituiscono immagini PIL o PNG in memoria per
+  una lista di target, con gli stessi render della build
+- render_assets restituisce tutti i file della build (contenitori, immagini di
+  avvio e file descrittivi compresi) come byte
+- generate scrive la build nei percorsi del manifest dentro una cartella data
+
+Le funzioni in memoria leggono solo il manifest (se il lato del master non è
+indicato), il file dei parametri (se params manca) e il logo sorgente per le
+icone 'source'; non scrivono mai su disco.
+"""
+
+import json
+import os
+
+
+def _master_size(master_size, direct, manifest_path):
+    """Lato del render master come nella riga di comando: se non indicato, quello del manifest"""
+    if direct:
+        return None
+    if master_size:
+        return master_size
+    from icon_tools.build import MANIFEST_PATH
+    with open(manifest_path or MANIFEST_PATH, encoding='utf-8') as f:
+        return json.load(f).get('master_size')
+
+
+def icon_targets(platforms=None, sizes=None, variants=None, manifest_path=None):
+    """Target del manifest, filtrati per piattaforma, dimensione in pixel e variante
+
+    Ogni filtro è una lista (None per non filtrare); i target restano
+    nell'ordine del manifest, con i percorsi relativi del manifest.
+    """
+    from icon_tools.build import MANIFEST_PATH, load_manifest
+    from icon_tools.planner import target_pixels
+
+    manifest = load_manifest(manifest_path or MANIFEST_PATH, platforms=platforms)
+    return [target for target in manifest['targets']
+            if (sizes is None or target_pixels(target) in sizes)
+            and (variants is None or target['variant'] in variants)]
+
+
+def _icon_jobs(targets, master_size, params):
+    """(job, livello, variante) per ogni bitmap distinta dei target, come nella build"""
+    from icon_tools.build import check_targets, job_source, variant_min_sizes
+    from icon_tools.planner import plan_jobs
+
+    check_targets(targets)
+    jobs = plan_jobs(targets)['jobs']
+    min_sizes = variant_min_sizes(jobs)
+    pyramids = {}
+    for job in jobs:
+        # Le piramidi vivono solo per questa chiamata: basta una chiave costante
+        level, variant = job_source(job, job['variant'], master_size, params, pyramids,
+                                    min_sizes[job['variant']], master_size)
+        yield job, level, variant
+
+
+def render_icons(targets, master_size=None, direct=False, params=None, manifest_path=None):
+    """Immagini RGBA dei target (voci nel formato del manifest), come {percorso: immagine}
+
+    Senza master_size si usa quello del manifest, come generate_icons.py;
+    con direct ogni icona viene disegnata alla sua dimensione. I percorsi con
+    la stessa bitmap condividono la stessa immagine. params sono i parametri
+    di params.load_params (senza, letti dal file predefinito).
+    """
+    from icon_tools.build import render_job
+    from icon_tools.params import VARIANT_PARAMS, load_params
+
+    params = params or load_params()
+    master_size = _master_size(master_size, direct, manifest_path)
+    images = {}
+    for job, level, variant in _icon_jobs(targets, master_size, params):
+        image = render_job(job, level, variant, params[VARIANT_PARAMS[variant]])
+        images.update(dict.fromkeys(job['paths'], image))
+    return images
+
+
+def encode_icons(targets, master_size=None, direct=False, params=None, png_options=None, manifest_path=None):
+    """PNG dei target come {percorso: byte}, identici ai file scritti dalla build
+
+    Gli argomenti sono quelli di render_icons; png_options sono le opzioni di
+    png.write_png (None per la codifica predefinita della build).
+    """
+    from icon_tools.build import encode_job
+    from icon_tools.params import VARIANT_PARAMS, load_params
+
+    params = params or load_params()
+    master_size = _master_size(master_size, direct, manifest_path)
+    files = {}
+    for job, level, variant in _icon_jobs(targets, master_size, params):
+        data = encode_job(job, level, variant, png_options, params[VARIANT_PARAMS[variant]])[0]
+        files.update(dict.fromkeys(job['paths'], data))
+    return files
+
+
+def render_assets(platforms=None, master_size=None, direct=False, params=None, png_options=None,
+                  manifest_path=None):
+    """Tutti i file della build delle piattaforme indicate come {percorso: byte}, nell'ordine della build
+
+    I percorsi sono quelli del manifest. I file descrittivi che conservano
+    campi esistenti (web/manifest.json) li leggono dalla cartella del
+    manifest, qualunque sia la cartella corrente.
+    """
+    from icon_tools.build import MANIFEST_PATH, load_manifest
+    from icon_tools.bundle import iter_assets
+
+    manifest_path = manifest_path or MANIFEST_PATH
+    root = os.path.dirname(os.path.abspath(manifest_path))
+    manifest = load_manifest(manifest_path, platforms=platforms, output_root=root)
+    master_size = _master_size(master_size, direct, manifest_path)
+    return {os.path.relpath(path, root).replace(os.sep, '/'): data
+            for _, path, data in iter_assets(manifest, master_size, params, png_options)}
+
+
+def generate(output_root, platforms=None, master_size=None, direct=False, workers=1, force=False,
+             params=None, png_options=None, profile=None, manifest_path=None):
+    """Scrive la build delle piattaforme indicate nei percorsi del manifest dentro output_root
+
+    output_root None vuol dire la cartella corrente. La cache della build sta
+    in output_root, quindi cartelle diverse non si invalidano a vicenda. Gli
+    altri argomenti sono quelli di build.build e di render_icons.
+    """
+    from icon_tools.build import MANIFEST_PATH, build, cache_path_for, load_manifest
+
+    manifest = load_manifest(manifest_path or MANIFEST_PATH, platforms=platforms, output_root=output_root)
+    build(manifest, master_size=_master_size(master_size, direct, manifest_path), workers=workers,
+          force=force, cache_path=cache_path_for(output_root), png_options=png_options, profile=profile,
+          params=params)
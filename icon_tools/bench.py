@@ -0,0 +1,250 @@
+"""
+Benchmark dei generatori di logo e icone
+
+Ogni fase viene misurata su una serie di dimensioni (tempo minimo e mediano
+su più ripetizioni e picco di memoria) in un processo separato, così il picco
+di memoria di una misura non dipende dalle precedenti. I risultati vengono
+scritti in JSON e possono essere confrontati con un baseline salvato.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+DEFAULT_SIZES = [16, 32, 64, 128, 256, 512, 1024, 2048, 4096]
+
+# Soglia di regressione predefinita: +20% rispetto al baseline
+DEFAULT_THRESHOLD = 0.2
+
+# Sotto questa durata le differenze sono rumore e non contano come regressioni
+NOISE_FLOOR = 0.002
+
+
+def _stage_gradient_background(size):
+    from icon_tools.logo import create_gradient_background
+    return create_gradient_background(size, size)
+
+
+def _stage_diamond_with_key(size):
+    from icon_tools.logo import LOGO_COLORS, create_diamond_with_key
+    return create_diamond_with_key(size, LOGO_COLORS)
+
+
+def _stage_app_logo(size):
+    from icon_tools.logo import create_app_logo
+    return create_app_logo(size)
+
+
+def _stage_gradient_icon(size):
+    from icon_tools.icons import create_gradient_icon
+    return create_gradient_icon(size)
+
+
+def _stage_source_icon(size):
+    from icon_tools.icons import create_source_icon
+    return create_source_icon(size)
+
+
+def _stage_full_build(size):
+    """Build completa del manifest in una cartella temporanea (size è ignorato)"""
+    from icon_tools.build import build, load_manifest
+
+    workdir = tempfile.mkdtemp(prefix='icon_bench_')
+    try:
+        build(load_manifest(output_root=workdir), force=True, cache_path=os.path.join(workdir, 'cache.json'))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# Fasi misurabili; le fasi con dimensione None non dipendono dalla dimensione
+STAGES = {
+    'create_gradient_background': _stage_gradient_background,
+    'create_diamond_with_key': _stage_diamond_with_key,
+    'create_app_logo': _stage_app_logo,
+    'create_gradient_icon': _stage_gradient_icon,
+    'create_source_icon': _stage_source_icon,
+    'build': _stage_full_build,
+}
+SIZELESS_STAGES = {'build'}
+
+
+def _repo_root():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _max_rss():
+    """Picco di memoria residente del processo in byte, oppure None se non disponibile"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux riporta kilobyte, macOS byte
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _clear_caches():
+    """Svuota le cache in memoria di icon_tools (lru_cache e logo sorgente decodificato)
+
+    Ogni esecuzione misurata parte così a freddo come una build vera, invece di
+    riusare maschere, livelli Android, geometrie delle palette e logo sorgente
+    rimasti dalla ripetizione precedente.
+    """
+    from icon_tools import icons
+
+    for name, module in list(sys.modules.items()):
+        if name.startswith('icon_tools.'):
+            for value in vars(module).values():
+                if hasattr(value, 'cache_clear'):
+                    value.cache_clear()
+    icons._source_cache.clear()
+
+
+def _measure(stage, size, repeat):
+    """Misura il picco di memoria di una fase e poi il tempo di repeat esecuzioni
+
+    Memoria e tempo sono misurati in passate separate: tracemalloc rallenta
+    molto le allocazioni e falserebbe i tempi. Prima di ogni esecuzione le
+    cache vengono svuotate.
+    """
+    import contextlib
+    import io
+
+    # Import dei moduli prima della misura, così non finiscono nel picco di memoria
+    import icon_tools.build
+
+    run = STAGES[stage]
+    timings = []
+    # La build stampa il proprio log: durante la misura viene scartato
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Prima la memoria: ru_maxrss è il picco di tutto il processo e non scende più
+        _clear_caches()
+        before = _max_rss()
+        tracemalloc.start()
+        run(size)
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        after = _max_rss()
+
+        for _ in range(repeat):
+            _clear_caches()
+            start = time.perf_counter()
+            run(size)
+            timings.append(time.perf_counter() - start)
+
+    # ru_maxrss vede anche le allocazioni di PIL, tracemalloc solo Python e NumPy
+    peak = max(after - before, traced_peak) if before is not None else traced_peak
+    return {
+        'stage': stage,
+        'size': size,
+        'repeat': repeat,
+        'seconds': min(timings),
+        'median_seconds': statistics.median(timings),
+        'peak_bytes': peak,
+    }
+
+
+def run_benchmarks(stages, sizes, repeat=3):
+    """Misura ogni fase per ogni dimensione, ciascuna in un processo nuovo"""
+    context = get_context('spawn')
+    results = []
+    for stage in stages:
+        for size in ([None] if stage in SIZELESS_STAGES else sizes):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(_measure, stage, size, repeat).result()
+            results.append(result)
+            label = stage if size is None else f"{stage} {size}px"
+            print(f"  ⏱️  {label}: {result['seconds'] * 1000:.1f} ms, "
+                  f"picco {result['peak_bytes'] / 2**20:.1f} MiB")
+    return results
+
+
+def _environment():
+    import numpy
+    import PIL
+
+    return {
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+        'numpy': numpy.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Confronta i risultati con un baseline e restituisce le regressioni trovate"""
+    reference = {(r['stage'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        base = reference.get((result['stage'], result['size']))
+        if base is None:
+            continue
+        if result['seconds'] < NOISE_FLOOR and base['seconds'] < NOISE_FLOOR:
+            continue
+        ratio = result['seconds'] / base['seconds'] if base['seconds'] else float('inf')
+        if ratio > 1 + threshold:
+            regressions.append(dict(result, baseline_seconds=base['seconds'], ratio=ratio))
+    return regressions
+
+
+def main(argv=None):
+    """Esegue i benchmark, salva i risultati in JSON e li confronta con un baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark dei generatori di logo e icone")
+    parser.add_argument('--stage', action='append', choices=sorted(STAGES),
+                        help="Misura solo questa fase (ripetibile, predefinito tutte)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, metavar='SIZE',
+                        help="Dimensioni da misurare (predefinito 16 … 4096)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Ripetizioni per misura; conta il tempo minimo (predefinito 3)")
+    parser.add_argument('--output', default='bench_results.json',
+                        help="File JSON dei risultati (predefinito bench_results.json)")
+    parser.add_argument('--baseline',
+                        help="File JSON di un'esecuzione precedente da usare come riferimento")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Rallentamento relativo oltre il quale una misura è una regressione "
+                             f"(predefinito {DEFAULT_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    # I processi di misura importano icon_tools dalla radice del repository
+    if _repo_root() not in sys.path:
+        sys.path.insert(0, _repo_root())
+
+    print("⏱️  Benchmark dei generatori di icone...")
+    results = run_benchmarks(args.stage or list(STAGES), args.sizes, args.repeat)
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': _environment(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"\n📄 Risultati salvati in {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if not regressions:
+        print(f"✅ Nessuna regressione rispetto a {args.baseline}")
+        return 0
+
+    print(f"❌ {len(regressions)} regressioni rispetto a {args.baseline}:")
+    for r in regressions:
+        label = r['stage'] if r['size'] is None else f"{r['stage']} {r['size']}px"
+        print(f"  {label}: {r['baseline_seconds'] * 1000:.1f} ms → {r['seconds'] * 1000:.1f} ms "
+              f"(x{r['ratio']:.2f})")
+    return 1
@@ -0,0 +1,766 @@
+"""
+Pipeline unica di generazione di logo e icone, guidata da icon_manifest.json
+
+Il manifest elenca ogni file da generare con piattaforma, dimensione, scala,
+percorso e variante. Tutte le piattaforme vengono generate nello stesso
+processo, così il render master e la piramide di ogni variante sono condivisi.
+Render e codifica PNG dei job possono essere distribuiti su un pool di processi.
+"""
+
+import argparse
+import cProfile
+import json
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from icon_tools import profiling
+from icon_tools.adaptive import (
+    ADAPTIVE_CANVAS_DP,
+    ADAPTIVE_VIEWPORT_DP,
+    create_adaptive_background,
+    create_adaptive_foreground,
+    create_legacy_icon,
+    create_round_icon,
+)
+from icon_tools.cache import CACHE_PATH, file_digest, is_fresh, job_key, load_cache, record, save_cache
+from icon_tools.containers import CONTAINER_PACKERS, save_container
+from icon_tools.icons import (
+    SOURCE_LOGO_PATH,
+    SOURCE_LOGO_SIZE,
+    create_gradient_icon,
+    create_source_icon,
+    load_source_logo,
+    source_logo_pixels,
+)
+from icon_tools.logo import create_app_logo
+from icon_tools.metadata import METADATA_FORMATS, write_metadata
+from icon_tools.palettes import PALETTE_ROOT, PALETTES_PATH, load_palettes, render_palettes
+from icon_tools.params import PARAMS_PATH, VARIANT_PARAMS, load_params
+from icon_tools.planner import link_output, plan_containers, plan_jobs, prepare_output, print_plan_report
+from icon_tools.png import DEFAULT_COMPRESS_LEVEL, DEFAULT_QUANTIZE_THRESHOLD, encode, write_png
+from icon_tools.pyramid import DEFAULT_MASTER_SIZE, build_pyramid, pyramid_level, resize_from_pyramid
+from icon_tools.splash import SPLASH_PARAMS, render_splash
+from icon_tools.tiled import TILED_MIN_SIZE, TILED_RENDERERS, encode_tiled, write_tiled
+from icon_tools.watch import DEFAULT_INTERVAL, watch
+
+# Manifest predefinito nella radice del repository
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'icon_manifest.json')
+
+# Funzione di disegno per ogni variante del manifest
+VARIANTS = {
+    'logo': create_app_logo,
+    'gradient': create_gradient_icon,
+    'source': create_source_icon,
+    'adaptive_background': create_adaptive_background,
+    'adaptive_foreground': create_adaptive_foreground,
+    'adaptive_legacy': create_legacy_icon,
+    'adaptive_round': create_round_icon,
+}
+
+# Varianti sempre disegnate alla loro dimensione, senza render master: i
+# livelli Android sono piccoli e le icone legacy sono composte dai livelli
+# già renderizzati nello stesso processo
+DIRECT_VARIANTS = {'adaptive_background', 'adaptive_foreground', 'adaptive_legacy', 'adaptive_round'}
+
+# Intestazione stampata all'inizio di ogni piattaforma
+PLATFORM_TITLES = {
+    'assets': "🎨 Generazione logo...",
+    'android': "🤖 Generazione icone Android...",
+    'ios': "🍎 Generazione icone iOS...",
+    'macos': "🖥️ Generazione icone macOS...",
+    'windows': "🪟 Generazione icone Windows...",
+    'web': "🌐 Generazione icone web...",
+}
+
+REQUIRED_FIELDS = ('platform', 'path', 'size', 'variant')
+REQUIRED_CONTAINER_FIELDS = ('platform', 'path', 'format', 'sizes', 'variant')
+REQUIRED_METADATA_FIELDS = ('platform', 'path', 'format')
+REQUIRED_SPLASH_FIELDS = ('platform', 'path', 'width', 'height', 'logo_size')
+
+
+def check_targets(entries, required=REQUIRED_FIELDS):
+    """Controlla campi obbligatori, variante e piattaforma di target (o contenitori) del manifest"""
+    for entry in entries:
+        missing = [field for field in required if field not in entry]
+        if missing:
+            raise ValueError(f"Target senza {', '.join(missing)} nel manifest: {entry}")
+        if entry['variant'] not in VARIANTS:
+            raise ValueError(f"Variante sconosciuta '{entry['variant']}' per {entry['path']}")
+        if entry['platform'] not in PLATFORM_TITLES:
+            raise ValueError(f"Piattaforma sconosciuta '{entry['platform']}' per {entry['path']}")
+
+
+def load_manifest(path=MANIFEST_PATH, platforms=None, output_root=None):
+    """Legge e valida il manifest, tenendo solo le piattaforme richieste
+
+    Con output_root tutti i percorsi da scrivere (e i 'prefix' dei file
+    descrittivi) vengono spostati dentro quella cartella; senza, restano
+    relativi alla cartella corrente.
+    """
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    manifest.setdefault('containers', [])
+    check_targets(manifest['targets'])
+    check_targets(manifest['containers'], REQUIRED_CONTAINER_FIELDS)
+
+    for container in manifest['containers']:
+        if container['format'] not in CONTAINER_PACKERS:
+            raise ValueError(f"Formato sconosciuto '{container['format']}' per {container['path']}")
+
+    manifest.setdefault('metadata', [])
+    for entry in manifest['metadata']:
+        missing = [field for field in REQUIRED_METADATA_FIELDS if field not in entry]
+        if missing:
+            raise ValueError(f"Voce metadata senza {', '.join(missing)} nel manifest: {entry}")
+        if entry['format'] not in METADATA_FORMATS:
+            raise ValueError(f"Formato sconosciuto '{entry['format']}' per {entry['path']}")
+        if entry['platform'] not in PLATFORM_TITLES:
+            raise ValueError(f"Piattaforma sconosciuta '{entry['platform']}' per {entry['path']}")
+
+    manifest.setdefault('splash', [])
+    for entry in manifest['splash']:
+        missing = [field for field in REQUIRED_SPLASH_FIELDS if field not in entry]
+        if missing:
+            raise ValueError(f"Voce splash senza {', '.join(missing)} nel manifest: {entry}")
+        if entry['platform'] not in PLATFORM_TITLES:
+            raise ValueError(f"Piattaforma sconosciuta '{entry['platform']}' per {entry['path']}")
+        sizes = (entry['width'], entry['height'], entry['logo_size'])
+        if not all(isinstance(size, int) and size > 0 for size in sizes):
+            raise ValueError(f"Dimensioni non valide per {entry['path']}: attesi interi positivi")
+        if entry['logo_size'] > min(entry['width'], entry['height']):
+            raise ValueError(f"Il logo di {entry['path']} è più grande del canvas")
+
+    if platforms:
+        unknown = set(platforms) - set(PLATFORM_TITLES)
+        if unknown:
+            raise ValueError(f"Piattaforme sconosciute: {', '.join(sorted(unknown))}")
+        manifest['targets'] = [t for t in manifest['targets'] if t['platform'] in platforms]
+        manifest['containers'] = [c for c in manifest['containers'] if c['platform'] in platforms]
+        manifest['metadata'] = [m for m in manifest['metadata'] if m['platform'] in platforms]
+        manifest['splash'] = [s for s in manifest['splash'] if s['platform'] in platforms]
+
+    if output_root is not None:
+        for entry in manifest['targets'] + manifest['containers'] + manifest['metadata'] + manifest['splash']:
+            entry['path'] = os.path.join(output_root, entry['path'])
+            if 'prefix' in entry:
+                entry['prefix'] = os.path.join(output_root, entry['prefix'])
+
+    return manifest
+
+
+def _master_image(variant, master_size, render_params):
+    """Render master di una variante; per 'source' è il logo sorgente già decodificato"""
+    if variant == 'source':
+        logo = load_source_logo()
+        if logo is not None:
+            return logo
+        return create_gradient_icon(master_size, **render_params)
+    return VARIANTS[variant](master_size, **render_params)
+
+
+def is_tiled(job, variant):
+    """Vero se il job è abbastanza grande da essere renderizzato a strisce"""
+    return job['size'] >= TILED_MIN_SIZE and variant in TILED_RENDERERS
+
+
+def job_source(job, variant, master_size, params, pyramids, min_size, key):
+    """Immagine da cui ricavare un job (o None per il disegno diretto) e variante da usare
+
+    In modalità master la piramide della variante viene presa da pyramids, dove
+    è memorizzata insieme a key, oppure renderizzata se manca o se key è
+    cambiata (parametri diversi da quelli di una build precedente).
+    """
+    level = None
+    if master_size and not is_tiled(job, variant) and variant not in DIRECT_VARIANTS:
+        # Il master viene renderizzato solo se almeno un job della variante è da rifare;
+        # gli output a strisce non passano dalla piramide, che andrebbe ingrandita
+        if pyramids.get(variant, (None,))[0] != key:
+            with profiling.target(f"master {variant}"):
+                with profiling.stage('master_render'):
+                    master = _master_image(variant, master_size, params[VARIANT_PARAMS[variant]])
+                pyramids[variant] = (key, build_pyramid(master, min_size=min_size))
+        level = pyramid_level(pyramids[variant][1], job['size'])
+    elif variant == 'source':
+        # Il logo sorgente viene decodificato e convertito in luce lineare qui una
+        # volta e passato ai job; se manca, tutti i job 'source' ripiegano sul gradiente
+        level = source_logo_pixels()
+        if level is None:
+            variant = 'gradient'
+    return level, variant
+
+
+def render_job(job, level, variant, render_params):
+    """Icona di un job in memoria, ricavata da level oppure disegnata direttamente"""
+    with profiling.stage('render'):
+        if level is not None:
+            return resize_from_pyramid([level], job['size'])
+        return VARIANTS[variant](job['size'], **render_params)
+
+
+def encode_job(job, level, variant, png_options=None, render_params=None):
+    """PNG di un job in memoria, come (byte, byte risparmiati) di png.encode
+
+    level e variant vengono da job_source; i job molto grandi vengono
+    codificati a strisce come nella build.
+    """
+    if level is None and is_tiled(job, variant):
+        compress_level = (png_options or {}).get('compress_level', DEFAULT_COMPRESS_LEVEL)
+        return encode_tiled(variant, job['size'], compress_level=compress_level, render_params=render_params), 0
+    return encode(render_job(job, level, variant, render_params), png_options)
+
+
+def variant_min_sizes(jobs, containers=(), splash=()):
+    """Dimensione minima richiesta per ogni variante, per limitare le piramidi"""
+    sizes = [(job['variant'], job['size']) for job in jobs]
+    sizes += [(container['variant'], min(container['size'])) for container in containers]
+    sizes += [('logo', entry['logo_size']) for entry in splash]
+
+    min_sizes = {}
+    for variant, size in sizes:
+        min_sizes[variant] = min(size, min_sizes.get(variant, size))
+    return min_sizes
+
+
+def splash_member(entry):
+    """Job 'logo' da cui si ricava il logo di una voce splash"""
+    return {'size': entry['logo_size'], 'variant': 'logo'}
+
+
+def render_splash_entry(entry, level, variant, params):
+    """Immagine di una voce splash; level e variant del logo vengono da job_source"""
+    member = splash_member(entry)
+    logo = render_job(member, level, variant, params[VARIANT_PARAMS[variant]])
+    return render_splash(entry['width'], entry['height'], logo, params[SPLASH_PARAMS]['colors'])
+
+
+def _run_job(job, level=None, variant=None, png_options=None, profile=False, render_params=None):
+    """Renderizza, codifica e salva un job; viene eseguito anche nei processi del pool
+
+    level è l'array lineare da cui ricavare l'icona (il livello della piramide
+    in modalità master, oppure il logo sorgente già convertito); senza, l'icona
+    viene disegnata direttamente con la variante indicata e con render_params
+    (colori e raggio), a strisce se è molto grande. Restituisce le statistiche
+    di write_png sul file codificato; con profile anche le fasi misurate
+    durante il job, da riportare nel processo principale.
+    """
+    profiling.enable(profile)
+    start = profiling.mark()
+    variant = variant or job['variant']
+    render_params = render_params or {}
+
+    first, *others = job['paths']
+    with profiling.target(first):
+        for path in job['paths']:
+            prepare_output(path)
+
+        if level is None and is_tiled(job, variant):
+            # L'immagine intera non viene mai allocata: le strisce vanno dirette nel PNG
+            compress_level = (png_options or {}).get('compress_level', DEFAULT_COMPRESS_LEVEL)
+            stats = write_tiled(variant, job['size'], first, compress_level=compress_level,
+                                render_params=render_params)
+        else:
+            stats = write_png(render_job(job, level, variant, render_params), first, png_options)
+
+        for path in others:
+            link_output(first, path)
+
+    stats['timings'] = profiling.take(start)
+    return stats
+
+
+class _SerialExecutor:
+    """Esecutore minimo che esegue i job subito, nel processo corrente"""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self):
+        pass
+
+
+def _variant_params(variant, params):
+    """Parametri di render di una variante, usati per la chiave di cache
+
+    Comprendono i valori del file dei parametri, quindi modificarne un gruppo
+    invalida solo le varianti che lo usano. Le icone 'source' dipendono dai
+    parametri del gradiente solo quando manca il logo sorgente.
+    """
+    if variant == 'source':
+        digest = file_digest(SOURCE_LOGO_PATH)
+        if digest is not None:
+            return {'source': digest}
+
+    key_params = dict(params[VARIANT_PARAMS[variant]])
+    if variant in DIRECT_VARIANTS:
+        key_params.update(canvas_dp=ADAPTIVE_CANVAS_DP, viewport_dp=ADAPTIVE_VIEWPORT_DP)
+    if variant in ('adaptive_background', 'adaptive_foreground'):
+        # I livelli non hanno angoli: il raggio non li cambia
+        del key_params['radius_ratio']
+    if variant == 'source':
+        key_params['source'] = None
+    return key_params
+
+
+def build(manifest, master_size=None, workers=1, force=False, cache_path=CACHE_PATH, png_options=None,
+          profile=None, params=None, pyramids=None):
+    """Genera tutti i target del manifest
+
+    I target identici (stessa dimensione e variante) sono renderizzati e
+    codificati una volta sola e collegati alle altre destinazioni. Con
+    master_size ogni variante viene renderizzata una sola volta e le dimensioni
+    sono ricavate dalla sua piramide; senza, ogni job viene disegnato
+    direttamente alla sua dimensione. Con più workers i job girano in parallelo,
+    ma l'output viene stampato sempre nell'ordine del manifest. Le icone da
+    TILED_MIN_SIZE in su vengono renderizzate a strisce con memoria limitata
+    (vedi tiled.py). I job già aggiornati secondo la cache vengono saltati, a
+    meno di force. Anche il logo sorgente, se è diverso dal file che la cache
+    registra come scritto dall'ultima build (sostituito a mano), non viene
+    sovrascritto dal suo target senza force. Con png_options (vedi png.write_png) i PNG vengono
+    ottimizzati nei worker.
+
+    Alla fine vengono scritti i contenitori del manifest (.ico, .icns), che
+    riusano i PNG appena codificati e renderizzano solo le dimensioni che
+    nessun target produce, le immagini di avvio (vedi splash.py), il cui logo
+    viene dalla stessa piramide delle icone 'logo', e poi i file descrittivi
+    (Contents.json, manifest.json, adaptive icon), generati dagli stessi
+    target e validati contro le bitmap scritte.
+
+    profile (vedi profile_options_from_args) attiva la misura delle fasi: la
+    tabella dei tempi viene stampata alla fine e, se richiesti, vengono
+    scritti una traccia Chrome e un profilo cProfile del processo principale.
+
+    params sono i parametri di disegno di params.load_params; senza, vengono
+    letti dal file dei parametri predefinito. pyramids è un dizionario da
+    passare a build successive dello stesso processo (modalità watch): le
+    piramidi dei master restano in memoria e vengono riusate finché variante,
+    parametri e logo sorgente non cambiano.
+    """
+    if params is None:
+        params = load_params()
+    profile = profile or {}
+    profiling.enable(bool(profile))
+    profiling.reset()
+    profiler = cProfile.Profile() if profile.get('cprofile') else None
+
+    plan = plan_jobs(manifest['targets'])
+    jobs = plan['jobs']
+    containers = plan_containers(manifest.get('containers', []), jobs)
+    cache = load_cache(cache_path)
+
+    # I job 'source' leggono il logo sorgente, quindi partono solo dopo che
+    # i job che lo scrivono (se presenti nel piano) sono terminati
+    source_path = next((path for job in jobs for path in job['paths']
+                        if os.path.abspath(path) == os.path.abspath(SOURCE_LOGO_PATH)), None)
+    deferred = [job for job in jobs if source_path and job['variant'] == 'source']
+
+    # Un logo sorgente diverso da quello scritto dall'ultima build è stato
+    # sostituito a mano: resta com'è (salvo force) e le icone 'source' lo usano.
+    # Senza una voce nella cache (prima build) il logo viene rigenerato.
+    source_job = None
+    source_entry = cache.get(source_path) if source_path else None
+    if source_entry and not force and file_digest(source_path) not in (None, source_entry['sha256']):
+        source_job = next(job for job in jobs if source_path in job['paths'])
+        source_job['paths'] = [path for path in source_job['paths'] if path != source_path]
+
+    splash = manifest.get('splash', [])
+    min_sizes = variant_min_sizes(jobs, containers, splash)
+
+    pyramids = {} if pyramids is None else pyramids
+    key_params = {}
+    keys = {}
+
+    def params_for(variant):
+        if variant not in key_params:
+            key_params[variant] = dict(_variant_params(variant, params), png=png_options)
+        return key_params[variant]
+
+    def source_for(job, variant):
+        """Immagine da cui ricavare il job e variante da usare (vedi job_source)"""
+        key = json.dumps([master_size, min_sizes[variant], params_for(variant)], sort_keys=True)
+        return job_source(job, variant, master_size, params, pyramids, min_sizes[variant], key)
+
+    def submit(executor, job):
+        """Avvia un job, oppure restituisce None se la cache dice che è aggiornato"""
+        key = job_key(job, params_for(job['variant']), master_size)
+        keys[id(job)] = key
+        if not force and is_fresh(cache, job, key):
+            return None
+
+        level, variant = source_for(job, job['variant'])
+        return executor.submit(_run_job, job, level, variant, png_options, profiling.is_enabled(),
+                               params[VARIANT_PARAMS[variant]])
+
+    def write_container(container):
+        """Impacchetta un contenitore; restituisce i byte scritti, oppure None se è aggiornato"""
+        key = job_key(container, dict(params_for(container['variant']), format=container['format']),
+                      master_size)
+        if not force and is_fresh(cache, container, key):
+            return None
+
+        payloads = {}
+        for size, source in container['sources'].items():
+            if source is not None:
+                # PNG già codificato da un job di questa build (o da una precedente, se in cache)
+                with open(source, 'rb') as f:
+                    payloads[size] = f.read()
+                continue
+            member = {'size': size, 'variant': container['variant']}
+            level, variant = source_for(member, container['variant'])
+            icon = render_job(member, level, variant, params[VARIANT_PARAMS[variant]])
+            payloads[size] = encode(icon, png_options)[0]
+
+        path = container['paths'][0]
+        prepare_output(path)
+        with profiling.stage('write') as timing:
+            written = save_container(path, container['format'], payloads)
+            timing['bytes'] = written
+        record(cache, container, key)
+        return written
+
+    def write_splash(entry):
+        """Scrive un'immagine di avvio; restituisce le statistiche di write_png, oppure None se è aggiornata"""
+        job = {'variant': 'splash', 'size': [entry['width'], entry['height'], entry['logo_size']],
+               'paths': [entry['path']]}
+        key = job_key(job, dict(params_for('logo'), background=params[SPLASH_PARAMS]['colors']), master_size)
+        if not force and is_fresh(cache, job, key):
+            return None
+
+        level, variant = source_for(splash_member(entry), 'logo')
+        image = render_splash_entry(entry, level, variant, params)
+        prepare_output(entry['path'])
+        stats = write_png(image, entry['path'], png_options)
+        record(cache, job, key)
+        return stats
+
+    skipped = 0
+    saved_bytes = 0
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else _SerialExecutor()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        futures = {id(job): submit(executor, job) for job in jobs if job not in deferred}
+
+        platform = None
+        for job in jobs:
+            if job in deferred and id(job) not in futures:
+                for future in list(futures.values()):
+                    if future is not None:
+                        future.result()
+                for pending in deferred:
+                    futures[id(pending)] = submit(executor, pending)
+
+            if job['targets'][0]['platform'] != platform:
+                platform = job['targets'][0]['platform']
+                print(PLATFORM_TITLES[platform])
+
+            size = job['size']
+            if job is source_job:
+                print(f"  ⏭️  {source_path} ({size}x{size}, diverso dall'ultima build, non sovrascritto)")
+            future = futures[id(job)]
+            if future is None:
+                skipped += 1
+                for path in job['paths']:
+                    print(f"  ⏭️  {path} ({size}x{size}, invariato)")
+                continue
+
+            stats = future.result()
+            profiling.extend(stats['timings'])
+            record(cache, job, keys[id(job)])
+
+            first, *others = job['paths']
+            if png_options is None:
+                print(f"  ✅ {first} ({size}x{size})")
+            else:
+                saved_bytes += stats['saved']
+                print(f"  ✅ {first} ({size}x{size}, {stats['bytes']} byte, "
+                      f"-{stats['saved']} byte)")
+            for path in others:
+                print(f"  🔗 {path} ({size}x{size})")
+
+        for container in containers:
+            if container['targets'][0]['platform'] != platform:
+                platform = container['targets'][0]['platform']
+                print(PLATFORM_TITLES[platform])
+
+            path = container['paths'][0]
+            label = f"{container['format'].upper()}, {', '.join(map(str, container['size']))}"
+            with profiling.target(path):
+                written = write_container(container)
+            if written is None:
+                skipped += 1
+                print(f"  ⏭️  {path} ({label}, invariato)")
+            else:
+                print(f"  📦 {path} ({label})")
+
+        for entry in splash:
+            if entry['platform'] != platform:
+                platform = entry['platform']
+                print(PLATFORM_TITLES[platform])
+
+            label = f"{entry['width']}x{entry['height']}, avvio"
+            with profiling.target(entry['path']):
+                stats = write_splash(entry)
+            if stats is None:
+                skipped += 1
+                print(f"  ⏭️  {entry['path']} ({label}, invariato)")
+            else:
+                print(f"  🚀 {entry['path']} ({label})")
+
+        for entry in manifest.get('metadata', []):
+            if entry['platform'] != platform:
+                platform = entry['platform']
+                print(PLATFORM_TITLES[platform])
+            if write_metadata(entry, manifest['targets']):
+                print(f"  📝 {entry['path']}")
+            else:
+                print(f"  ⏭️  {entry['path']} (invariato)")
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        executor.shutdown()
+        save_cache(cache, cache_path)
+
+    print_plan_report(plan['stats'])
+    if skipped:
+        print(f"   Job invariati saltati grazie alla cache: {skipped} di "
+              f"{len(jobs) + len(containers) + len(splash)}")
+    if png_options is not None:
+        print(f"   Byte risparmiati dall'ottimizzazione PNG: {saved_bytes}")
+
+    _report_profile(profile)
+    if profiler is not None:
+        profiler.dump_stats(profile['cprofile'])
+        print(f"📄 Profilo cProfile salvato in {profile['cprofile']}")
+
+
+def _report_profile(profile):
+    """Stampa la tabella dei tempi e scrive la traccia Chrome, se richiesti"""
+    if profile:
+        profiling.print_summary()
+    if profile.get('trace'):
+        profiling.write_chrome_trace(profile['trace'])
+        print(f"\n📄 Traccia delle fasi salvata in {profile['trace']}")
+
+
+def build_palettes(manifest, palettes, output_root=PALETTE_ROOT, master_size=None, png_options=None,
+                   profile=None):
+    """Genera le bitmap del manifest una volta per palette, in output_root/<nome palette>
+
+    palettes è la lista di palettes.load_palettes. Per ogni job la geometria
+    viene calcolata una volta e colorata con tutte le palette insieme (vedi
+    palettes.py); con master_size ogni variante ha un solo render master per
+    palette e le dimensioni sono ricavate dalle piramidi. I target da
+    TILED_MIN_SIZE in su restano a strisce, una palette alla volta. Contenitori
+    e file descrittivi non fanno parte dei set delle palette.
+    """
+    profile = profile or {}
+    profiling.enable(bool(profile))
+    profiling.reset()
+    plan = plan_jobs(manifest['targets'])
+    params = [palette['params'] for palette in palettes]
+
+    min_sizes = variant_min_sizes(plan['jobs'])
+    pyramids = {}
+
+    def images_for(job):
+        """Un'immagine del job per ogni palette"""
+        variant = job['variant']
+        if variant == 'source':
+            # Come nella build principale, le icone 'source' sono ricavate dal logo
+            # sorgente della palette (il suo target 'logo' a SOURCE_LOGO_SIZE)
+            if variant not in pyramids:
+                logo = {'size': SOURCE_LOGO_SIZE, 'variant': 'logo'}
+                min_size = min_sizes[variant] if master_size else SOURCE_LOGO_SIZE
+                pyramids[variant] = [build_pyramid(image, min_size=min_size) for image in images_for(logo)]
+            return [resize_from_pyramid(levels, job['size']) for levels in pyramids[variant]]
+        if master_size and variant not in DIRECT_VARIANTS:
+            if variant not in pyramids:
+                with profiling.target(f"master {variant}"):
+                    with profiling.stage('master_render'):
+                        masters = render_palettes(variant, master_size, params)
+                    pyramids[variant] = [build_pyramid(master, min_size=min_sizes.get(variant, 1))
+                                         for master in masters]
+            return [resize_from_pyramid(levels, job['size']) for levels in pyramids[variant]]
+        with profiling.stage('render'):
+            return render_palettes(variant, job['size'], params)
+
+    def outputs(palette, job):
+        """Percorsi del job nel set della palette, con le cartelle pronte"""
+        paths = [os.path.join(output_root, palette['name'], path) for path in job['paths']]
+        for path in paths:
+            prepare_output(path)
+        return paths
+
+    platform = None
+    for job in plan['jobs']:
+        if job['targets'][0]['platform'] != platform:
+            platform = job['targets'][0]['platform']
+            print(PLATFORM_TITLES[platform])
+
+        size = job['size']
+        with profiling.target(job['paths'][0]):
+            if is_tiled(job, job['variant']):
+                compress_level = (png_options or {}).get('compress_level', DEFAULT_COMPRESS_LEVEL)
+                for palette in palettes:
+                    first, *others = outputs(palette, job)
+                    write_tiled(job['variant'], size, first, compress_level=compress_level,
+                                render_params=palette['params'][VARIANT_PARAMS[job['variant']]])
+                    for path in others:
+                        link_output(first, path)
+            else:
+                for palette, image in zip(palettes, images_for(job)):
+                    first, *others = outputs(palette, job)
+                    write_png(image, first, png_options)
+                    for path in others:
+                        link_output(first, path)
+        print(f"  ✅ {job['paths'][0]} ({size}x{size}, {len(palettes)} palette)")
+
+    print(f"\n🎨 Set delle palette scritti in {output_root}: {', '.join(p['name'] for p in palettes)}")
+    _report_profile(profile)
+
+
+def add_build_arguments(parser):
+    """Aggiunge le opzioni di build comuni a tutti gli script"""
+    parser.add_argument('--master', type=int, nargs='?', const=DEFAULT_MASTER_SIZE, metavar='SIZE',
+                        help="Renderizza una sola volta a SIZE px e ricava tutte le dimensioni "
+                             f"da una piramide di ridimensionamento (predefinito {DEFAULT_MASTER_SIZE})")
+    parser.add_argument('--direct', action='store_true',
+                        help="Disegna ogni target alla sua dimensione invece di usare il render master")
+    parser.add_argument('-j', '--jobs', type=int, nargs='?', const=os.cpu_count(), default=1, metavar='N',
+                        help="Numero di processi per render e codifica PNG "
+                             "(senza valore usa tutti i core, predefinito 1)")
+    parser.add_argument('--force', action='store_true',
+                        help="Rigenera tutti i file anche se la cache li considera aggiornati")
+    parser.add_argument('--optimize', action='store_true',
+                        help="Ottimizza i PNG (filtro delle righe e strategia zlib migliori, "
+                             "palette a 8 bit se possibile)")
+    parser.add_argument('--zlib-level', type=int, default=9, choices=range(10), metavar='0-9',
+                        help="Livello di compressione zlib con --optimize (predefinito 9)")
+    parser.add_argument('--quantize-threshold', type=int, default=DEFAULT_QUANTIZE_THRESHOLD, metavar='N',
+                        help="Errore massimo per canale accettato per la palette a 8 bit; "
+                             f"negativo per disattivarla (predefinito {DEFAULT_QUANTIZE_THRESHOLD})")
+    parser.add_argument('--output-root', metavar='DIR',
+                        help="Scrive i file nei percorsi del manifest dentro DIR, con la sua cache "
+                             "(predefinita la cartella corrente)")
+    parser.add_argument('--timings', action='store_true',
+                        help="Misura tempo reale, tempo CPU e byte scritti di ogni fase e target "
+                             "e stampa la tabella riassuntiva")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="Scrive le fasi misurate in FILE in formato Chrome trace (implica --timings)")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="Scrive in FILE un profilo cProfile del processo principale (implica --timings)")
+
+
+def png_options_from_args(args):
+    """Opzioni di write_png ricavate dalla riga di comando, oppure None senza --optimize"""
+    if not args.optimize:
+        return None
+    return {
+        'compress_level': args.zlib_level,
+        'quantize_threshold': args.quantize_threshold if args.quantize_threshold >= 0 else None,
+    }
+
+
+def cache_path_for(output_root):
+    """Cache della build per i file scritti in output_root (None: la cartella corrente)"""
+    return CACHE_PATH if output_root is None else os.path.join(output_root, CACHE_PATH)
+
+
+def profile_options_from_args(args):
+    """Opzioni di profilazione di build ricavate dalla riga di comando, oppure None"""
+    if not (args.timings or args.trace or args.profile):
+        return None
+    return {'trace': args.trace, 'cprofile': args.profile}
+
+
+def main(argv=None):
+    """Genera logo e icone di tutte le piattaforme elencate nel manifest"""
+    # verify e bundle usano le funzioni di render di questo modulo: import locali per evitare il ciclo
+    from icon_tools.bundle import BUNDLE_FORMATS, export_bundle
+    from icon_tools.verify import DEFAULT_MAX_RATIO, DEFAULT_TOLERANCE, REPORT_DIR, verify
+
+    parser = argparse.ArgumentParser(description="Genera logo e icone di tutte le piattaforme")
+    parser.add_argument('--manifest', default=MANIFEST_PATH,
+                        help="Percorso del manifest dei target (predefinito icon_manifest.json)")
+    parser.add_argument('--platform', action='append', choices=sorted(PLATFORM_TITLES),
+                        help="Genera solo questa piattaforma (ripetibile)")
+    add_build_arguments(parser)
+    parser.add_argument('--params', default=PARAMS_PATH,
+                        help="File dei parametri di disegno (predefinito icon_params.json, facoltativo)")
+    parser.add_argument('--watch', type=float, nargs='?', const=DEFAULT_INTERVAL, metavar='SECONDI',
+                        help="Resta attivo e rigenera i target interessati quando cambiano logo sorgente, "
+                             f"parametri o manifest (controllo ogni {DEFAULT_INTERVAL}s se non indicato)")
+    parser.add_argument('--palettes', nargs='?', const=PALETTES_PATH, metavar='FILE',
+                        help="Invece del set principale genera un set per ogni palette di FILE "
+                             "(predefinito icon_palettes.json)")
+    parser.add_argument('--palette-root', default=PALETTE_ROOT, metavar='DIR',
+                        help=f"Cartella dei set delle palette, una sottocartella per palette "
+                             f"(predefinita {PALETTE_ROOT})")
+    parser.add_argument('--verify', action='store_true',
+                        help="Non scrive nulla: renderizza i target in memoria come la build e li "
+                             "confronta con i PNG su disco")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, metavar='N',
+                        help="Differenza percettiva per pixel accettata da --verify, 0-255 "
+                             f"(predefinita {DEFAULT_TOLERANCE})")
+    parser.add_argument('--max-ratio', type=float, default=DEFAULT_MAX_RATIO, metavar='R',
+                        help="Frazione di pixel che può superare la tolleranza "
+                             f"(predefinita {DEFAULT_MAX_RATIO})")
+    parser.add_argument('--report-dir', default=REPORT_DIR, metavar='DIR',
+                        help="Cartella delle immagini di confronto dei target falliti "
+                             f"(predefinita {REPORT_DIR})")
+    parser.add_argument('--bundle', metavar='FILE',
+                        help="Non scrive i file nel repository: li mette tutti nell'archivio FILE "
+                             f"({', '.join(BUNDLE_FORMATS)}) con un indice degli hash")
+    args = parser.parse_args(argv)
+
+    if args.bundle:
+        manifest = load_manifest(args.manifest, platforms=args.platform)
+        master_size = None if args.direct else (args.master or manifest.get('master_size'))
+        export_bundle(manifest, args.bundle, master_size=master_size, params=load_params(args.params),
+                      png_options=png_options_from_args(args))
+        return
+
+    if args.verify:
+        manifest = load_manifest(args.manifest, platforms=args.platform, output_root=args.output_root)
+        master_size = None if args.direct else (args.master or manifest.get('master_size'))
+        passed = verify(manifest, master_size=master_size, params=load_params(args.params),
+                        tolerance=args.tolerance, max_ratio=args.max_ratio, report_dir=args.report_dir)
+        if not passed:
+            raise SystemExit(1)
+        return
+
+    force = args.force
+    pyramids = {}
+
+    def rebuild():
+        nonlocal force
+        params = load_params(args.params)
+
+        if args.palettes:
+            # I set delle palette hanno la loro cartella (--palette-root)
+            manifest = load_manifest(args.manifest, platforms=args.platform)
+            master_size = None if args.direct else (args.master or manifest.get('master_size'))
+            build_palettes(manifest, load_palettes(args.palettes, base=params), args.palette_root,
+                           master_size=master_size, png_options=png_options_from_args(args),
+                           profile=profile_options_from_args(args))
+        else:
+            manifest = load_manifest(args.manifest, platforms=args.platform, output_root=args.output_root)
+            master_size = None if args.direct else (args.master or manifest.get('master_size'))
+            build(manifest, master_size=master_size, workers=args.jobs, force=force,
+                  cache_path=cache_path_for(args.output_root), png_options=png_options_from_args(args),
+                  profile=profile_options_from_args(args), params=params, pyramids=pyramids)
+            # --force vale solo per la prima build del watch
+            force = False
+        print("\n🎉 Icone generate con successo!")
+
+    if args.watch is None:
+        rebuild()
+    else:
+        watched = [args.manifest, args.params, SOURCE_LOGO_PATH]
+        if args.palettes:
+            watched.append(args.palettes)
+        watch(watched, rebuild, args.watch)
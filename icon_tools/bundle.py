@@ -0,0 +1,193 @@
+"""
+Esportazione di tutte le icone in un solo archivio (zip o tar), da usare come
+artefatto di CI
+
+Ogni file viene renderizzato e codificato in memoria e scritto subito
+nell'archivio, senza file intermedi su disco: bitmap dei target, contenitori
+(.ico, .icns, impacchettati dai PNG appena codificati), immagini di avvio e
+file descrittivi, con i percorsi del manifest. In fondo all'archivio un indice
+JSON riporta per ogni file SHA-256 e dimensione.
+
+L'archivio è riproducibile: i PNG sono canonici (vedi png.py) e i membri hanno
+data, permessi e proprietario fissi, quindi con gli stessi sorgenti si ottiene
+lo stesso archivio byte per byte.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import tarfile
+import zipfile
+from functools import partial
+
+from icon_tools import profiling
+from icon_tools.build import (
+    PLATFORM_TITLES,
+    encode_job,
+    job_source,
+    render_splash_entry,
+    splash_member,
+    variant_min_sizes,
+)
+from icon_tools.cache import generator_version
+from icon_tools.containers import CONTAINER_PACKERS
+from icon_tools.metadata import METADATA_FORMATS
+from icon_tools.params import VARIANT_PARAMS, load_params
+from icon_tools.planner import plan_containers, plan_jobs
+from icon_tools.png import encode
+
+# Nome dell'indice con hash e dimensioni, ultimo membro dell'archivio
+INDEX_NAME = 'icon_index.json'
+
+# Data dei membri dello zip: la minima ammessa dal formato (i membri tar hanno 0)
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+# Permessi dei file nell'archivio
+MEMBER_MODE = 0o644
+
+
+class _ZipBundle:
+    """Archivio zip senza compressione: i PNG sono già compressi"""
+
+    def __init__(self, path):
+        self.archive = zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED)
+
+    def add(self, name, data):
+        info = zipfile.ZipInfo(name, ZIP_DATE)
+        info.create_system = 3
+        info.external_attr = MEMBER_MODE << 16
+        self.archive.writestr(info, data)
+
+    def close(self):
+        self.archive.close()
+
+
+class _TarBundle:
+    """Archivio tar, compresso con gzip se richiesto (senza data nell'intestazione)"""
+
+    def __init__(self, path, compress):
+        self.file = open(path, 'wb')
+        self.gzip = gzip.GzipFile(filename='', mode='wb', fileobj=self.file, mtime=0) if compress else None
+        self.archive = tarfile.open(fileobj=self.gzip or self.file, mode='w', format=tarfile.PAX_FORMAT)
+
+    def add(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = MEMBER_MODE
+        info.mtime = 0
+        self.archive.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self.archive.close()
+        if self.gzip is not None:
+            self.gzip.close()
+        self.file.close()
+
+
+# Formato dell'archivio in base all'estensione
+BUNDLE_FORMATS = {
+    '.zip': _ZipBundle,
+    '.tar': partial(_TarBundle, compress=False),
+    '.tar.gz': partial(_TarBundle, compress=True),
+    '.tgz': partial(_TarBundle, compress=True),
+}
+
+
+def open_bundle(path):
+    """Apre in scrittura un archivio del formato indicato dall'estensione di path"""
+    for suffix, opener in BUNDLE_FORMATS.items():
+        if path.endswith(suffix):
+            return opener(path)
+    raise ValueError(f"Formato di archivio non supportato: {path} "
+                     f"(estensioni ammesse: {', '.join(BUNDLE_FORMATS)})")
+
+
+def iter_assets(manifest, master_size=None, params=None, png_options=None):
+    """Genera (piattaforma, percorso, byte) per ogni file della build, senza scrivere nulla
+
+    L'ordine è quello della build: target, contenitori, immagini di avvio e
+    file descrittivi. I target con la stessa bitmap vengono codificati una
+    volta sola. Le icone 'source' partono dal logo sorgente su disco.
+    """
+    if params is None:
+        params = load_params()
+    plan = plan_jobs(manifest['targets'])
+    jobs = plan['jobs']
+    containers = plan_containers(manifest.get('containers', []), jobs)
+    splash = manifest.get('splash', [])
+    min_sizes = variant_min_sizes(jobs, containers, splash)
+    pyramids = {}
+
+    def source_for(job, variant):
+        # Le piramidi vivono solo per questa esportazione: basta una chiave costante
+        return job_source(job, variant, master_size, params, pyramids, min_sizes[variant], master_size)
+
+    def encoded(job):
+        level, variant = source_for(job, job['variant'])
+        return encode_job(job, level, variant, png_options, params[VARIANT_PARAMS[variant]])[0]
+
+    # PNG dei job riusati dai contenitori, tenuti in memoria fino all'impacchettamento
+    wanted = {(size, container['variant']) for container in containers for size in container['size']}
+    payloads = {}
+
+    for job in jobs:
+        with profiling.target(job['paths'][0]):
+            data = encoded(job)
+        if (job['size'], job['variant']) in wanted:
+            payloads[job['size'], job['variant']] = data
+        for path in job['paths']:
+            yield job['targets'][0]['platform'], path, data
+
+    for container in containers:
+        path = container['paths'][0]
+        with profiling.target(path):
+            sizes = {}
+            for size in container['size']:
+                key = (size, container['variant'])
+                if key not in payloads:
+                    payloads[key] = encoded({'size': size, 'variant': container['variant']})
+                sizes[size] = payloads[key]
+            data = CONTAINER_PACKERS[container['format']](sizes)
+        yield container['targets'][0]['platform'], path, data
+
+    for entry in splash:
+        with profiling.target(entry['path']):
+            level, variant = source_for(splash_member(entry), 'logo')
+            data = encode(render_splash_entry(entry, level, variant, params), png_options)[0]
+        yield entry['platform'], entry['path'], data
+
+    for entry in manifest.get('metadata', []):
+        generate, _ = METADATA_FORMATS[entry['format']]
+        yield entry['platform'], entry['path'], generate(entry, manifest['targets']).encode('utf-8')
+
+
+def export_bundle(manifest, path, master_size=None, params=None, png_options=None):
+    """Scrive tutti i file della build nell'archivio path (zip o tar) con l'indice INDEX_NAME
+
+    Restituisce l'indice: versione del generatore e, per ogni percorso, SHA-256 e byte.
+    """
+    bundle = open_bundle(path)
+    files = {}
+    platform = None
+    try:
+        for asset_platform, name, data in iter_assets(manifest, master_size, params, png_options):
+            if asset_platform != platform:
+                platform = asset_platform
+                print(PLATFORM_TITLES[platform])
+            if name in files:
+                raise ValueError(f"{name} compare due volte nell'archivio")
+
+            with profiling.stage('bundle') as timing:
+                bundle.add(name, data)
+                timing['bytes'] = len(data)
+            files[name] = {'sha256': hashlib.sha256(data).hexdigest(), 'bytes': len(data)}
+            print(f"  📥 {name} ({len(data)} byte)")
+
+        index = {'generator': generator_version(), 'files': files}
+        bundle.add(INDEX_NAME, (json.dumps(index, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+    finally:
+        bundle.close()
+
+    print(f"\n📦 {len(files)} file in {path}, indice in {INDEX_NAME}")
+    return index
@@ -0,0 +1,88 @@
+"""
+Cache della build: ogni file generato viene registrato con una chiave che
+dipende dai parametri di render, dal logo sorgente e dalla versione del
+generatore. Se la chiave non cambia e il file su disco è intatto, il job viene
+saltato senza renderizzare né riscrivere nulla (le date di modifica restano
+invariate e Xcode, Gradle e Flutter non ricompilano gli asset).
+"""
+
+import glob
+import hashlib
+import json
+import os
+
+# File della cache, relativo alla cartella da cui si lancia la build
+CACHE_PATH = '.icon_cache.json'
+
+_generator_version = None
+
+
+def file_digest(path):
+    """SHA-256 del contenuto di un file, oppure None se non esiste"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def generator_version():
+    """Versione del generatore: hash dei sorgenti di icon_tools
+
+    Qualsiasi modifica al codice di disegno invalida automaticamente la cache.
+    """
+    global _generator_version
+    if _generator_version is None:
+        digest = hashlib.sha256()
+        for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), '*.py'))):
+            digest.update(os.path.basename(path).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        _generator_version = digest.hexdigest()
+    return _generator_version
+
+
+def job_key(job, params, master_size=None):
+    """Chiave di cache di un job: parametri di render, dimensione, variante e versione"""
+    payload = {
+        'generator': generator_version(),
+        'variant': job['variant'],
+        'size': job['size'],
+        'master_size': master_size,
+        'params': params,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def load_cache(path=CACHE_PATH):
+    """Legge la cache; una cache mancante o illeggibile equivale a una cache vuota"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, path=CACHE_PATH):
+    """Scrive la cache su disco"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def is_fresh(cache, job, key):
+    """True se tutti i file del job sono registrati con questa chiave e non sono cambiati"""
+    for path in job['paths']:
+        entry = cache.get(path)
+        if not entry or entry['key'] != key or file_digest(path) != entry['sha256']:
+            return False
+    return True
+
+
+def record(cache, job, key):
+    """Registra nella cache i file appena scritti da un job"""
+    for path in job['paths']:
+        cache[path] = {'key': key, 'sha256': file_digest(path)}
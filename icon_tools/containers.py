@@ -0,0 +1,117 @@
+"""
+Contenitori multi-risoluzione: .ico per Windows e .icns per macOS
+
+Entrambi i formati accettano immagini PNG al loro interno, quindi le funzioni
+di questo modulo ricevono i PNG già codificati dalla build ({dimensione:
+byte}) e si limitano a impacchettarli, senza ridisegnare né ricodificare
+nulla. I contenitori non hanno date né campi variabili: a parità di PNG i
+byte sono sempre gli stessi.
+"""
+
+import struct
+
+# Dimensione massima di un'immagine in un file .ico
+ICO_MAX_SIZE = 256
+
+# Tipi .icns per ogni dimensione in pixel (le varianti @2x condividono la bitmap)
+ICNS_TYPES = {
+    16: (b'icp4',),
+    32: (b'icp5', b'ic11'),
+    64: (b'icp6', b'ic12'),
+    128: (b'ic07',),
+    256: (b'ic08', b'ic13'),
+    512: (b'ic09', b'ic14'),
+    1024: (b'ic10',),
+}
+
+
+def pack_ico(payloads):
+    """Contenuto di un .ico con un'immagine PNG per dimensione"""
+    sizes = sorted(payloads)
+    too_large = [size for size in sizes if size > ICO_MAX_SIZE]
+    if too_large:
+        raise ValueError(f"Dimensioni non ammesse in un .ico (massimo {ICO_MAX_SIZE}): {too_large}")
+
+    header = struct.pack('<HHH', 0, 1, len(sizes))
+    offset = len(header) + 16 * len(sizes)
+    entries = []
+    for size in sizes:
+        data = payloads[size]
+        # Nella directory 0 indica 256 pixel
+        dimension = size % 256
+        entries.append(struct.pack('<BBBBHHII', dimension, dimension, 0, 0, 1, 32, len(data), offset))
+        offset += len(data)
+
+    return header + b''.join(entries) + b''.join(payloads[size] for size in sizes)
+
+
+def pack_icns(payloads):
+    """Contenuto di un .icns con i PNG forniti, sotto tutti i tipi che li usano"""
+    unsupported = sorted(set(payloads) - set(ICNS_TYPES))
+    if unsupported:
+        raise ValueError(f"Dimensioni non ammesse in un .icns: {unsupported}")
+
+    elements = []
+    for size in sorted(payloads):
+        for icon_type in ICNS_TYPES[size]:
+            data = payloads[size]
+            elements.append(icon_type + struct.pack('>I', len(data) + 8) + data)
+
+    body = b''.join(elements)
+    return b'icns' + struct.pack('>I', len(body) + 8) + body
+
+
+def unpack_ico(data):
+    """PNG contenuti in un .ico scritto da pack_ico, come {dimensione: byte}"""
+    reserved, kind, count = struct.unpack_from('<HHH', data)
+    if reserved != 0 or kind != 1:
+        raise ValueError("Il file non è un .ico")
+    payloads = {}
+    for index in range(count):
+        width, _, _, _, _, _, length, offset = struct.unpack_from('<BBBBHHII', data, 6 + 16 * index)
+        payloads[width or 256] = data[offset:offset + length]
+    return payloads
+
+
+def unpack_icns(data):
+    """PNG contenuti in un .icns scritto da pack_icns, come {dimensione: byte}
+
+    Se più tipi della stessa dimensione hanno PNG diversi viene sollevato
+    ValueError: pack_icns li scrive sempre uguali.
+    """
+    if data[:4] != b'icns':
+        raise ValueError("Il file non è un .icns")
+    sizes = {icon_type: size for size, types in ICNS_TYPES.items() for icon_type in types}
+    payloads = {}
+    offset = 8
+    while offset < len(data):
+        icon_type, length = struct.unpack_from('>4sI', data, offset)
+        payload = data[offset + 8:offset + length]
+        offset += length
+        if icon_type not in sizes:
+            continue
+        size = sizes[icon_type]
+        if payloads.setdefault(size, payload) != payload:
+            raise ValueError(f"Il .icns ha immagini diverse per {size}x{size}")
+    return payloads
+
+
+# Impacchettatore per ogni formato di contenitore del manifest
+CONTAINER_PACKERS = {
+    'ico': pack_ico,
+    'icns': pack_icns,
+}
+
+# Lettura dei PNG di ogni formato di contenitore, per la verifica
+CONTAINER_READERS = {
+    'ico': unpack_ico,
+    'icns': unpack_icns,
+}
+
+
+def save_container(path, container_format, payloads):
+    """Scrive un contenitore del formato indicato; restituisce i byte scritti"""
+    data = CONTAINER_PACKERS[container_format](payloads)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
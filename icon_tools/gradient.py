@@ -0,0 +1,92 @@
+"""
+Gradienti lineari e multi-stop calcolati come array NumPy
+"""
+
+import numpy as np
+from PIL import Image
+
+from icon_tools.profiling import stage
+
+
+def _normalize_stops(stops):
+    """Converte gli stop in due array (posizioni, colori)
+
+    Gli stop possono essere una lista di colori, distribuiti uniformemente
+    tra 0 e 1, oppure una lista di coppie (posizione, colore).
+    """
+    if len(stops) < 2:
+        raise ValueError("Un gradiente richiede almeno due colori")
+
+    if isinstance(stops[0][1], (tuple, list)):
+        positions = [pos for pos, _ in stops]
+        colors = [color for _, color in stops]
+    else:
+        positions = [i / (len(stops) - 1) for i in range(len(stops))]
+        colors = list(stops)
+
+    channels = len(colors[0])
+    if any(len(color) != channels for color in colors):
+        raise ValueError("Tutti i colori del gradiente devono avere gli stessi canali")
+
+    return np.asarray(positions, dtype=np.float64), np.asarray(colors, dtype=np.float64)
+
+
+def colorize(t, stops):
+    """Mappa un array di posizioni (0-1) sui colori del gradiente
+
+    Restituisce un array uint8 con forma t.shape + (canali,). L'interpolazione
+    tronca all'intero come il vecchio codice riga per riga, quindi i pixel
+    coincidono con quelli generati finora.
+    """
+    return colorize_many(t, [stops])[0]
+
+
+def colorize_many(t, palettes):
+    """Mappa le stesse posizioni sui colori di più gradienti in un solo passaggio
+
+    I gradienti devono avere stop nelle stesse posizioni e gli stessi canali;
+    segmenti e pesi dell'interpolazione vengono calcolati una volta sola.
+    Restituisce un array uint8 con forma (gradienti,) + t.shape + (canali,).
+    """
+    normalized = [_normalize_stops(stops) for stops in palettes]
+    positions = normalized[0][0]
+    if any(not np.array_equal(other, positions) for other, _ in normalized):
+        raise ValueError("I gradienti elaborati insieme devono avere stop nelle stesse posizioni")
+    if len({colors.shape[-1] for _, colors in normalized}) > 1:
+        raise ValueError("I gradienti elaborati insieme devono avere gli stessi canali")
+    colors = np.stack([colors for _, colors in normalized])
+    t = np.asarray(t, dtype=np.float64)
+
+    # Segmento del gradiente in cui cade ogni posizione (pos <= stop -> segmento precedente)
+    index = np.searchsorted(positions, t, side='left') - 1
+    index = np.clip(index, 0, len(positions) - 2)
+
+    start = positions[index]
+    end = positions[index + 1]
+    # Due stop nella stessa posizione (salto netto) danno un segmento vuoto: lì
+    # si prende il colore dello stop successivo invece di dividere per zero
+    width = end - start
+    local = np.divide(t - start, width, out=np.ones(np.shape(width)), where=width > 0)[..., None]
+
+    result = colors[:, index] * (1 - local) + colors[:, index + 1] * local
+    return np.clip(result, 0, 255).astype(np.uint8)
+
+
+def gradient_array(width, height, stops, direction='vertical'):
+    """Crea un gradiente lineare come array (height, width, canali)"""
+    if direction == 'vertical':
+        ramp = colorize(np.arange(height) / height, stops)
+        array = np.broadcast_to(ramp[:, None, :], (height, width, ramp.shape[-1]))
+    elif direction == 'horizontal':
+        ramp = colorize(np.arange(width) / width, stops)
+        array = np.broadcast_to(ramp[None, :, :], (height, width, ramp.shape[-1]))
+    else:
+        raise ValueError(f"Direzione del gradiente non supportata: {direction}")
+
+    return np.ascontiguousarray(array)
+
+
+def linear_gradient(width, height, stops, direction='vertical'):
+    """Crea un'immagine PIL con un gradiente lineare (RGB o RGBA in base ai colori)"""
+    with stage('gradient'):
+        return Image.fromarray(gradient_array(width, height, stops, direction))
@@ -0,0 +1,118 @@
+"""
+Icone delle piattaforme: icona con gradiente (macOS e fallback)
+e icona ricavata dal logo sorgente (Android e iOS)
+"""
+
+import os
+
+import numpy as np
+from PIL import Image
+
+from icon_tools.gradient import gradient_array, linear_gradient
+from icon_tools.masks import apply_rounded_mask, rounded_square_mask_rows
+from icon_tools.profiling import stage
+from icon_tools.resample import delinearize, linearize, resize_linear
+
+# Logo sorgente da cui vengono ricavate le icone Android e iOS, nella radice del
+# repository qualunque sia la cartella corrente o quella di output
+SOURCE_LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'assets', 'logo_512x512.png')
+
+# Lato del logo sorgente, scritto dal target 'logo' del manifest con lo stesso percorso
+SOURCE_LOGO_SIZE = 512
+
+# Colori del gradiente (viola, rosa, blu)
+GRADIENT_COLORS = [
+    (139, 92, 246, 255),  # Viola #8B5CF6
+    (236, 72, 153, 255),  # Rosa #EC4899
+    (59, 130, 246, 255),  # Blu #3B82F6
+]
+
+# Raggio degli angoli arrotondati delle icone, in proporzione al lato
+ICON_RADIUS_RATIO = 0.2
+
+
+def create_gradient_icon(size, colors=GRADIENT_COLORS, radius_ratio=ICON_RADIUS_RATIO):
+    """Crea un'icona con gradiente e bordi arrotondati"""
+    
+    # Crea il gradiente verticale (viola -> rosa -> blu)
+    img = linear_gradient(size, size, colors, direction='vertical')
+    
+    # Aggiungi bordi arrotondati
+    return apply_rounded_mask(img, radius_ratio)
+
+
+def render_gradient_icon_rows(size, top, bottom, colors=GRADIENT_COLORS, radius_ratio=ICON_RADIUS_RATIO):
+    """Righe top:bottom di create_gradient_icon(size) come array RGBA, per il render a strisce"""
+    rows = np.empty((bottom - top, size, 4), dtype=np.uint8)
+    rows[...] = gradient_array(1, size, colors, direction='vertical')[top:bottom]
+    rows[..., 3] = rounded_square_mask_rows(size, top, bottom, radius_ratio)
+    return rows
+
+
+# Logo sorgente già decodificato: {percorso assoluto: [mtime, immagine o None, pixel lineari o None]}
+_source_cache = {}
+
+
+def load_source_logo(logo_path=SOURCE_LOGO_PATH):
+    """Carica il logo sorgente in RGBA, oppure None se non è disponibile
+
+    Il PNG viene decodificato una sola volta per processo e riutilizzato finché
+    la sua data di modifica non cambia; anche la decisione di ripiegare sul
+    gradiente viene presa (e segnalata) una volta sola. L'immagine restituita è
+    condivisa: va solo letta o ridimensionata, mai modificata.
+    """
+    path = os.path.abspath(logo_path)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    cached = _source_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    logo = None
+    if mtime is None:
+        print(f"⚠️ Logo non trovato: {logo_path}, uso il gradiente generato come fallback")
+    else:
+        try:
+            with stage('decode'), Image.open(path) as image:
+                logo = image.convert('RGBA')
+        except Exception as e:
+            print(f"⚠️ Errore nel caricare il logo: {e}, uso il gradiente generato come fallback")
+
+    _source_cache[path] = [mtime, logo, None]
+    return logo
+
+
+def source_logo_pixels(logo_path=SOURCE_LOGO_PATH):
+    """Il logo sorgente come array lineare premoltiplicato (vedi resample.py), oppure None
+
+    La conversione avviene una volta per decodifica: tutte le dimensioni
+    ricavate dal logo partono dallo stesso array, che va solo letto.
+    """
+    logo = load_source_logo(logo_path)
+    if logo is None:
+        return None
+    cached = _source_cache[os.path.abspath(logo_path)]
+    if cached[2] is None:
+        cached[2] = linearize(logo)
+        cached[2].flags.writeable = False
+    return cached[2]
+
+
+def create_source_icon(size, logo_path=SOURCE_LOGO_PATH, colors=GRADIENT_COLORS,
+                       radius_ratio=ICON_RADIUS_RATIO):
+    """Crea un'icona ridimensionando il logo sorgente, con fallback al gradiente
+
+    colors e radius_ratio valgono solo per l'icona con gradiente di fallback.
+    """
+    # Usa il logo 512x512 già decodificato e lo ridimensiona in luce lineare
+    if load_source_logo(logo_path) is not None:
+        with stage('resize'):
+            pixels = resize_linear(source_logo_pixels(logo_path), size)
+        return delinearize(pixels)
+    
+    # Fallback: crea un'icona con gradiente
+    return create_gradient_icon(size, colors, radius_ratio)
@@ -0,0 +1,205 @@
+"""
+Disegno del logo dell'app Password Manager: sfondo sfumato viola-rosa,
+rombo bianco e chiave con i colori del gradiente
+"""
+
+import math
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from icon_tools.gradient import gradient_array, linear_gradient
+from icon_tools.masks import apply_rounded_mask, rounded_square_mask, rounded_square_mask_rows
+from icon_tools.profiling import stage
+from icon_tools.shapes import disc_mask, fill_shape, polygon_mask, rect_mask
+
+# Colori del logo: viola a rosa/magenta
+LOGO_COLORS = [
+    (139, 92, 246),   # Viola #8B5CF6
+    (236, 72, 153),   # Magenta #EC4899
+]
+
+# Raggio degli angoli arrotondati del logo, in proporzione al lato
+LOGO_RADIUS_RATIO = 0.15
+
+
+def create_gradient_background(width, height, colors=LOGO_COLORS):
+    """Crea uno sfondo con sfumatura da viola a rosa/magenta"""
+    # Gradiente orizzontale calcolato in un'unica operazione sull'array
+    return linear_gradient(width, height, colors, direction='horizontal')
+
+
+def create_rounded_square_mask(size, radius_ratio=LOGO_RADIUS_RATIO):
+    """Crea una maschera per angoli arrotondati (con anti-aliasing, vedi masks.py)"""
+    return Image.fromarray(rounded_square_mask(size, radius_ratio))
+
+
+def create_key_icon(size, color=(255, 255, 255)):
+    """Crea un'icona di chiave semplice"""
+    # Crea un'immagine trasparente per la chiave
+    key = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(key)
+    
+    # Dimensioni della chiave - aumentate per renderla più grande
+    key_size = int(size * 0.6)
+    x_offset = (size - key_size) // 2
+    y_offset = (size - key_size) // 2
+    
+    # Disegna la chiave
+    # Anello della chiave
+    ring_center_x = x_offset + key_size * 0.25
+    ring_center_y = y_offset + key_size * 0.25
+    ring_radius = key_size * 0.18
+    draw.ellipse([
+        ring_center_x - ring_radius,
+        ring_center_y - ring_radius,
+        ring_center_x + ring_radius,
+        ring_center_y + ring_radius
+    ], fill=color)
+    
+    # Asta della chiave
+    shaft_width = key_size * 0.1
+    shaft_length = key_size * 0.65
+    shaft_x = ring_center_x + ring_radius - shaft_width // 2
+    shaft_y = ring_center_y
+    draw.rectangle([
+        shaft_x, shaft_y,
+        shaft_x + shaft_length, shaft_y + shaft_width
+    ], fill=color)
+    
+    # Denti della chiave
+    teeth_width = key_size * 0.15
+    teeth_height = key_size * 0.1
+    teeth_x = shaft_x + shaft_length - teeth_width
+    teeth_y = shaft_y - teeth_height // 2
+    draw.rectangle([
+        teeth_x, teeth_y,
+        teeth_x + teeth_width, teeth_y + teeth_height
+    ], fill=color)
+    
+    return key
+
+
+def create_diamond_with_key(size, gradient_colors):
+    """Crea un rombo con chiave al centro con colori del gradiente"""
+    # Canvas RGBA trasparente su cui vengono rasterizzate tutte le forme
+    canvas = np.zeros((size, size, 4), dtype=np.uint8)
+    draw_diamond_with_key(canvas, size, gradient_colors)
+    return Image.fromarray(canvas)
+
+
+def draw_diamond_with_key(canvas, size, gradient_colors, top=0, fill=fill_shape):
+    """Disegna rombo e chiave di un logo size x size su un canvas RGBA
+
+    Il canvas può contenere solo una striscia dell'immagine: la sua prima riga
+    corrisponde alla riga top del logo (usato dal render a strisce). fill
+    riceve ogni forma con il suo riempimento, come shapes.fill_shape (le
+    palette la sostituiscono per registrare la sola geometria).
+    """
+    # Dimensioni del rombo
+    diamond_size = int(size * 0.7)
+    x_offset = (size - diamond_size) // 2
+    y_offset = (size - diamond_size) // 2
+    
+    # Punti del rombo (diamante)
+    diamond_points = [
+        # Punta superiore
+        (x_offset + diamond_size // 2, y_offset - top),
+        # Punta destra
+        (x_offset + diamond_size, y_offset + diamond_size // 2 - top),
+        # Punta inferiore
+        (x_offset + diamond_size // 2, y_offset + diamond_size - top),
+        # Punta sinistra
+        (x_offset, y_offset + diamond_size // 2 - top),
+    ]
+    
+    # Disegna il rombo bianco
+    fill(canvas, polygon_mask(canvas.shape, diamond_points), (255, 255, 255))
+    
+    # Dimensioni della chiave con colori del gradiente
+    key_size = int(size * 0.3)
+    key_x_offset = (size - key_size) // 2
+    key_y_offset = (size - key_size) // 2
+    
+    # Disegna la chiave con gradiente - aumentata per renderla più grande
+    key_actual_size = int(key_size * 0.6)
+    key_actual_x_offset = key_x_offset + (key_size - key_actual_size) // 2
+    key_actual_y_offset = key_y_offset + (key_size - key_actual_size) // 2
+    
+    # Anello della chiave
+    ring_center_x = key_actual_x_offset + key_actual_size * 0.25
+    ring_center_y = key_actual_y_offset + key_actual_size * 0.25
+    ring_radius = key_actual_size * 0.18
+    
+    # Disegna l'anello con gradiente diagonale a partire dall'angolo del suo riquadro
+    ring_left = math.floor(ring_center_x - ring_radius)
+    ring_top = math.floor(ring_center_y - ring_radius) - top
+    fill(
+        canvas,
+        disc_mask(canvas.shape, ring_center_x, ring_center_y - top, ring_radius),
+        gradient_colors,
+        start=(ring_left, ring_top),
+        end=(ring_left + ring_radius * 2, ring_top + ring_radius * 2),
+    )
+    
+    # Asta della chiave
+    shaft_width = key_actual_size * 0.1
+    shaft_length = key_actual_size * 0.65
+    shaft_x = ring_center_x + ring_radius - shaft_width // 2
+    shaft_y = ring_center_y
+    shaft_top = shaft_y - top
+    
+    # Disegna l'asta con gradiente orizzontale
+    shaft_left = math.floor(shaft_x)
+    fill(
+        canvas,
+        rect_mask(canvas.shape, shaft_left, shaft_top, shaft_left + int(shaft_length), shaft_top + shaft_width),
+        gradient_colors,
+        start=(shaft_left, shaft_top),
+        end=(shaft_left + shaft_length, shaft_top),
+    )
+    
+    # Denti della chiave
+    teeth_width = key_actual_size * 0.15
+    teeth_height = key_actual_size * 0.1
+    teeth_x = shaft_x + shaft_length - teeth_width
+    teeth_y = shaft_y - teeth_height // 2
+    fill(
+        canvas,
+        rect_mask(canvas.shape, teeth_x, teeth_y - top, teeth_x + teeth_width, teeth_y - top + teeth_height),
+        gradient_colors[1],
+    )
+    
+    return canvas
+
+
+def create_app_logo(size=512, colors=LOGO_COLORS, radius_ratio=LOGO_RADIUS_RATIO):
+    """Crea il logo completo dell'app con rombo e chiave"""
+    # Crea lo sfondo con sfumatura
+    background = create_gradient_background(size, size, colors)
+    
+    # Crea il rombo con chiave con i colori del gradiente
+    with stage('shapes'):
+        diamond_with_key = create_diamond_with_key(size, colors)
+    
+    # Combina sfondo e rombo con chiave
+    with stage('composite'):
+        result = background.copy()
+        result.paste(diamond_with_key, (0, 0), diamond_with_key)
+    
+    # Applica la maschera per angoli arrotondati come canale alpha
+    return apply_rounded_mask(result, radius_ratio)
+
+
+def render_app_logo_rows(size, top, bottom, colors=LOGO_COLORS, radius_ratio=LOGO_RADIUS_RATIO):
+    """Righe top:bottom di create_app_logo(size) come array RGBA, per il render a strisce"""
+    rows = np.empty((bottom - top, size, 4), dtype=np.uint8)
+    rows[..., :3] = gradient_array(size, 1, colors, direction='horizontal')
+    
+    # Rombo e chiave sono opachi: dove coprono lo sfondo ne prendono il colore
+    layer = np.zeros_like(rows)
+    draw_diamond_with_key(layer, size, colors, top)
+    np.copyto(rows[..., :3], layer[..., :3], where=(layer[..., 3:] == 255))
+    
+    rows[..., 3] = rounded_square_mask_rows(size, top, bottom, radius_ratio)
+    return rows
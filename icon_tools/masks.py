@@ -0,0 +1,71 @@
+"""
+Maschere per gli angoli arrotondati, con anti-aliasing analitico
+
+L'alpha di ogni pixel è la copertura del quadrato arrotondato stimata dalla
+distanza del centro del pixel dal bordo, quindi anche le icone piccole hanno
+angoli morbidi. Solo gli angoli vengono calcolati; le maschere intere sono
+memorizzate per (size, radius_ratio) e condivise da tutti i generatori.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+from icon_tools.profiling import stage
+
+# Maschere intere tenute in memoria (le meno usate di recente vengono scartate)
+MASK_CACHE_SIZE = 32
+
+
+def _corner_rows(radius, edges):
+    """Alpha (0-255) delle righe edges dell'angolo in alto a sinistra, array (righe, radius)
+
+    Si calcolano solo le righe richieste, così il render a strisce non alloca
+    mai l'angolo intero (radius x radius in float64 per le icone più grandi).
+    """
+    centers = np.arange(radius) + 0.5
+    coverage = np.hypot(radius - centers[None, :], radius - centers[edges, None])
+    coverage -= radius
+    np.subtract(0.5, coverage, out=coverage)
+    np.clip(coverage, 0.0, 1.0, out=coverage)
+    coverage *= 255
+    return np.round(coverage, out=coverage).astype(np.uint8)
+
+
+def _corner_radius(size, radius_ratio):
+    return min(int(size * radius_ratio), size // 2)
+
+
+def rounded_square_mask_rows(size, top, bottom, radius_ratio):
+    """Righe top:bottom della maschera di un quadrato arrotondato size x size"""
+    rows = np.full((bottom - top, size), 255, dtype=np.uint8)
+    radius = _corner_radius(size, radius_ratio)
+    if radius == 0:
+        return rows
+
+    # Distanza di ogni riga dal bordo più vicino: solo le prime radius righe hanno angoli
+    ys = np.arange(top, bottom)
+    edge = np.minimum(ys, size - 1 - ys)
+    in_corner = edge < radius
+    corner = _corner_rows(radius, edge[in_corner])
+    rows[in_corner, :radius] = corner
+    rows[in_corner, size - radius:] = corner[:, ::-1]
+    return rows
+
+
+@lru_cache(maxsize=MASK_CACHE_SIZE)
+def rounded_square_mask(size, radius_ratio):
+    """Maschera intera di un quadrato arrotondato (condivisa: l'array è in sola lettura)"""
+    with stage('mask'):
+        mask = rounded_square_mask_rows(size, 0, size, radius_ratio)
+    mask.flags.writeable = False
+    return mask
+
+
+def apply_rounded_mask(image, radius_ratio):
+    """Restituisce una copia RGBA dell'immagine con gli angoli arrotondati come alpha"""
+    with stage('composite'):
+        pixels = np.array(image.convert('RGBA'))
+        pixels[..., 3] = rounded_square_mask(image.width, radius_ratio)
+        return Image.fromarray(pixels)
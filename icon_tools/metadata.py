@@ -0,0 +1,212 @@
+"""
+File descrittivi delle piattaforme generati dagli stessi target delle bitmap:
+Contents.json degli appiconset Xcode, icone di web/manifest.json e XML
+dell'adaptive icon Android (mipmap-anydpi-v26)
+
+Ogni voce della sezione 'metadata' del manifest indica piattaforma, formato e
+percorso del file; i target descritti sono quelli della stessa piattaforma il
+cui percorso inizia con 'prefix' (predefinito: la cartella del file). Dopo la
+scrittura ogni file viene validato contro le bitmap su disco.
+"""
+
+import json
+import os
+
+from PIL import Image
+
+from icon_tools.adaptive import ADAPTIVE_CANVAS_DP, LEGACY_ICON_DP
+from icon_tools.planner import target_pixels
+
+ANDROID_NAMESPACE = "http://schemas.android.com/apk/res/android"
+
+
+def _size_label(size):
+    """Dimensione nel formato di Xcode e dei manifest web (20 -> '20x20', 83.5 -> '83.5x83.5')"""
+    return f"{size:g}x{size:g}"
+
+
+def _pixel_size(path):
+    """Dimensioni in pixel di un'immagine su disco, oppure None se non è leggibile"""
+    try:
+        with Image.open(path) as image:
+            return image.size
+    except OSError:
+        return None
+
+
+def described_targets(entry, targets):
+    """Target descritti da una voce 'metadata' del manifest"""
+    prefix = entry.get('prefix', os.path.dirname(entry['path']) + '/')
+    return [t for t in targets if t['platform'] == entry['platform'] and t['path'].startswith(prefix)]
+
+
+def appiconset_contents(entry, targets):
+    """Contents.json di un appiconset: un'immagine per target con idiom"""
+    images = []
+    for target in described_targets(entry, targets):
+        if 'idiom' not in target:
+            continue
+        images.append({
+            'filename': os.path.basename(target['path']),
+            'idiom': target['idiom'],
+            'scale': f"{target.get('scale', 1)}x",
+            'size': _size_label(target['size']),
+        })
+    contents = {'images': images, 'info': {'author': 'xcode', 'version': 1}}
+    # Stesso formato dei file scritti da Xcode, così i diff restano puliti
+    return json.dumps(contents, indent=2, sort_keys=True, separators=(',', ' : ')) + '\n'
+
+
+def validate_appiconset(entry, targets):
+    """Ogni immagine dell'appiconset deve esistere, una sola volta, alla dimensione dichiarata"""
+    directory = os.path.dirname(entry['path'])
+    with open(entry['path'], encoding='utf-8') as f:
+        images = json.load(f)['images']
+
+    problems = []
+    seen = set()
+    for image in images:
+        slot = (image['idiom'], image['size'], image['scale'])
+        if slot in seen:
+            problems.append(f"{image['idiom']} {image['size']}@{image['scale']} ripetuto")
+        seen.add(slot)
+
+        points = float(image['size'].split('x')[0])
+        expected = int(points * int(image['scale'].rstrip('x')))
+        actual = _pixel_size(os.path.join(directory, image['filename']))
+        if actual is None:
+            problems.append(f"{image['filename']} mancante")
+        elif actual != (expected, expected):
+            problems.append(f"{image['filename']} è {actual[0]}x{actual[1]}, "
+                            f"attesi {expected}x{expected} per {image['size']}@{image['scale']}")
+    return problems
+
+
+def web_manifest(entry, targets):
+    """web/manifest.json con la lista 'icons' rigenerata e gli altri campi invariati"""
+    directory = os.path.dirname(entry['path'])
+    try:
+        with open(entry['path'], encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+
+    icons = []
+    for target in described_targets(entry, targets):
+        pixels = target_pixels(target)
+        icon = {
+            'src': os.path.relpath(target['path'], directory).replace(os.sep, '/'),
+            'sizes': _size_label(pixels),
+            'type': 'image/png',
+        }
+        if 'purpose' in target:
+            icon['purpose'] = target['purpose']
+        icons.append(icon)
+    manifest['icons'] = icons
+    return json.dumps(manifest, indent=4, ensure_ascii=False) + '\n'
+
+
+def validate_web_manifest(entry, targets):
+    """Ogni icona del manifest web deve esistere alla dimensione dichiarata"""
+    directory = os.path.dirname(entry['path'])
+    with open(entry['path'], encoding='utf-8') as f:
+        icons = json.load(f).get('icons', [])
+
+    problems = []
+    for icon in icons:
+        expected = tuple(int(v) for v in icon['sizes'].split('x'))
+        actual = _pixel_size(os.path.join(directory, icon['src']))
+        if actual is None:
+            problems.append(f"{icon['src']} mancante")
+        elif actual != expected:
+            problems.append(f"{icon['src']} è {actual[0]}x{actual[1]}, attesi {icon['sizes']}")
+
+    # Senza icone 192 e 512 il browser non propone l'installazione della PWA
+    for required in ('192x192', '512x512'):
+        if not any(icon['sizes'] == required and icon.get('purpose', 'any') == 'any' for icon in icons):
+            problems.append(f"manca un'icona {required} con purpose 'any'")
+    return problems
+
+
+def _adaptive_layers(entry):
+    """Nome della risorsa e nomi dei livelli di sfondo e primo piano dell'adaptive icon
+
+    Con 'layers' la voce usa i livelli di un'altra icona (ic_launcher_round
+    condivide quelli di ic_launcher).
+    """
+    name = os.path.splitext(os.path.basename(entry['path']))[0]
+    layers = entry.get('layers', name)
+    return name, f"{layers}_background", f"{layers}_foreground"
+
+
+def adaptive_icon_xml(entry, targets):
+    """XML dell'adaptive icon Android che usa i livelli mipmap di sfondo e primo piano"""
+    _, background, foreground = _adaptive_layers(entry)
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        f'<adaptive-icon xmlns:android="{ANDROID_NAMESPACE}">\n'
+        f'    <background android:drawable="@mipmap/{background}"/>\n'
+        f'    <foreground android:drawable="@mipmap/{foreground}"/>\n'
+        '</adaptive-icon>\n'
+    )
+
+
+def validate_adaptive_icon(entry, targets):
+    """Ogni densità che ha l'icona legacy deve avere entrambi i livelli, a 108dp contro 48dp"""
+    name, background, foreground = _adaptive_layers(entry)
+    res = os.path.dirname(os.path.dirname(entry['path']))
+    android = [t for t in targets if t['platform'] == entry['platform'] and t['path'].startswith(res + '/')]
+
+    densities = {}
+    for target in android:
+        folder = os.path.basename(os.path.dirname(target['path']))
+        stem = os.path.splitext(os.path.basename(target['path']))[0]
+        densities.setdefault(folder, {})[stem] = target_pixels(target)
+
+    problems = []
+    for folder, files in sorted(densities.items()):
+        if name not in files:
+            continue
+        for layer in (background, foreground):
+            if layer not in files:
+                problems.append(f"{folder}: manca {layer}")
+            elif files[layer] * LEGACY_ICON_DP != files[name] * ADAPTIVE_CANVAS_DP:
+                problems.append(f"{folder}: {layer} è {files[layer]} px, attesi "
+                                f"{files[name] * ADAPTIVE_CANVAS_DP // LEGACY_ICON_DP} px "
+                                f"per {name} da {files[name]} px")
+    if not any(name in files for files in densities.values()):
+        problems.append(f"nessuna densità contiene {name}")
+    return problems
+
+
+# Formati della sezione 'metadata' del manifest: (generatore, validatore)
+METADATA_FORMATS = {
+    'appiconset': (appiconset_contents, validate_appiconset),
+    'webmanifest': (web_manifest, validate_web_manifest),
+    'adaptive-icon': (adaptive_icon_xml, validate_adaptive_icon),
+}
+
+
+def write_metadata(entry, targets):
+    """Genera, scrive (solo se cambiato) e valida un file descrittivo
+
+    Restituisce True se il file è stato riscritto. Se la validazione trova
+    problemi viene sollevato ValueError con l'elenco completo.
+    """
+    generate, validate = METADATA_FORMATS[entry['format']]
+    content = generate(entry, targets)
+
+    try:
+        with open(entry['path'], encoding='utf-8') as f:
+            changed = f.read() != content
+    except FileNotFoundError:
+        changed = True
+    if changed:
+        os.makedirs(os.path.dirname(entry['path']) or '.', exist_ok=True)
+        with open(entry['path'], 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    problems = validate(entry, targets)
+    if problems:
+        raise ValueError(f"{entry['path']} non è valido:\n  " + "\n  ".join(problems))
+    return changed
@@ -0,0 +1,229 @@
+"""
+Set di icone con palette diverse (tema scuro, tinta, build di staging, stagionali)
+renderizzati in un solo passaggio
+
+La geometria di una variante (sfondo, rombo, chiave e le posizioni di ogni
+pixel lungo i gradienti) non dipende dai colori: viene rasterizzata una volta
+come mappa di indici in una tabella di voci (posizione su un gradiente, stop
+della palette o colore fisso). Ogni palette diventa così una tabella di colori
+di poche migliaia di righe, e tutte le immagini si ottengono con un solo
+accesso indicizzato all'array. N palette costano una geometria più N
+colorazioni, non N render completi.
+
+Il file delle palette (icon_palettes.json nella radice del repository) elenca
+le palette con un nome e le modifiche ai parametri, nello stesso formato di
+icon_params.json:
+
+    {
+        "palettes": [
+            {"name": "dark", "logo": {"colors": [[76, 29, 149], [157, 23, 77]]}}
+        ]
+    }
+"""
+
+import json
+import math
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+from icon_tools.adaptive import ROUND_RADIUS_RATIO, compose_legacy_icon, layer_viewport, legacy_layer_size
+from icon_tools.gradient import colorize_many
+from icon_tools.logo import draw_diamond_with_key
+from icon_tools.masks import rounded_square_mask
+from icon_tools.params import VARIANT_PARAMS, merge_params
+from icon_tools.profiling import stage
+from icon_tools.shapes import gradient_positions
+
+# File delle palette predefinito nella radice del repository
+PALETTES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'icon_palettes.json')
+
+# Cartella in cui ogni palette scrive il proprio set (una sottocartella per nome)
+PALETTE_ROOT = 'icon_variants'
+
+# Geometrie tenute in memoria (indici uint32 e posizioni per ogni dimensione)
+COVERAGE_CACHE_SIZE = 16
+
+# I nomi delle palette diventano cartelle: niente separatori né '..'
+PALETTE_NAME = re.compile(r'^[A-Za-z0-9_-]+$')
+
+# Segnaposto degli stop passato al disegno al posto dei colori veri
+_Stop = namedtuple('_Stop', 'index')
+PALETTE_STOPS = (_Stop(0), _Stop(1))
+
+
+class _Table:
+    """Tabella delle voci della geometria: posizioni sui gradienti e colori costanti"""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.constants = {}
+
+    def positions(self, t):
+        """Aggiunge una voce per ogni posizione e ne restituisce gli indici"""
+        first = self.size
+        self.chunks.append(np.asarray(t, dtype=np.float64))
+        self.size += len(t)
+        return np.arange(first, self.size, dtype=np.uint32)
+
+    def constant(self, entry):
+        """Aggiunge una voce costante, ('stop', i) oppure ('rgba', colore), e ne restituisce l'indice"""
+        self.chunks.append(np.array([math.nan]))
+        self.constants[self.size] = entry
+        self.size += 1
+        return self.size - 1
+
+    def fill(self, canvas, shape, paint, start=None, end=None):
+        """Come shapes.fill_shape, ma scrive nel canvas gli indici delle voci invece dei colori"""
+        window, mask, _, _ = shape
+        if isinstance(paint[0], (tuple, list)):
+            canvas[window][mask] = self.positions(gradient_positions(shape, start, end))
+        elif isinstance(paint, _Stop):
+            canvas[window][mask] = self.constant(('stop', paint.index))
+        else:
+            canvas[window][mask] = self.constant(('rgba', tuple(paint) + (255,) * (4 - len(paint))))
+        return canvas
+
+    def coverage(self, index):
+        index.flags.writeable = False
+        return {'index': index, 't': np.concatenate(self.chunks), 'constants': self.constants}
+
+
+def _horizontal(table, size):
+    """Indici di uno sfondo size x size con gradiente orizzontale"""
+    index = np.empty((size, size), dtype=np.uint32)
+    index[:] = table.positions(np.arange(size) / size)
+    return index
+
+
+@lru_cache(maxsize=COVERAGE_CACHE_SIZE)
+def logo_coverage(size):
+    """Geometria di create_app_logo(size): sfondo orizzontale, rombo bianco e chiave"""
+    with stage('coverage'):
+        table = _Table()
+        index = _horizontal(table, size)
+        draw_diamond_with_key(index, size, PALETTE_STOPS, fill=table.fill)
+        return table.coverage(index)
+
+
+@lru_cache(maxsize=COVERAGE_CACHE_SIZE)
+def gradient_coverage(size):
+    """Geometria di create_gradient_icon(size): gradiente verticale"""
+    with stage('coverage'):
+        table = _Table()
+        index = np.empty((size, size), dtype=np.uint32)
+        index[:] = table.positions(np.arange(size) / size)[:, None]
+        return table.coverage(index)
+
+
+@lru_cache(maxsize=COVERAGE_CACHE_SIZE)
+def background_coverage(size):
+    """Geometria del livello di sfondo dell'adaptive icon: solo il gradiente orizzontale"""
+    with stage('coverage'):
+        table = _Table()
+        return table.coverage(_horizontal(table, size))
+
+
+@lru_cache(maxsize=COVERAGE_CACHE_SIZE)
+def foreground_coverage(size):
+    """Geometria del livello di primo piano dell'adaptive icon: il simbolo su trasparenza"""
+    with stage('coverage'):
+        table = _Table()
+        index = np.full((size, size), table.constant(('rgba', (0, 0, 0, 0))), dtype=np.uint32)
+        viewport, offset = layer_viewport(size)
+        draw_diamond_with_key(index[offset:offset + viewport, offset:offset + viewport], viewport,
+                              PALETTE_STOPS, fill=table.fill)
+        return table.coverage(index)
+
+
+# Geometria di ogni variante disegnata direttamente dalle palette. Le icone
+# 'source' non hanno una geometria propria: la build le ricava dal logo a 512 px
+COVERAGES = {
+    'logo': logo_coverage,
+    'gradient': gradient_coverage,
+    'adaptive_background': background_coverage,
+    'adaptive_foreground': foreground_coverage,
+}
+
+
+def colorize_coverage(coverage, palettes):
+    """Colora una geometria con ogni lista di stop: array RGBA (palette, altezza, larghezza, 4)"""
+    with stage('colorize'):
+        t = coverage['t']
+        gradient = np.flatnonzero(~np.isnan(t))
+        luts = np.empty((len(palettes), len(t), 4), dtype=np.uint8)
+        luts[:, gradient, 3] = 255
+
+        # Le palette con lo stesso numero di stop vengono interpolate insieme
+        by_stops = {}
+        for n, stops in enumerate(palettes):
+            by_stops.setdefault(len(stops), []).append(n)
+        for members in by_stops.values():
+            colors = colorize_many(t[gradient], [palettes[n] for n in members])
+            luts[np.ix_(members, gradient, range(3))] = colors[..., :3]
+
+        for entry, (kind, value) in coverage['constants'].items():
+            if kind == 'stop':
+                for n, stops in enumerate(palettes):
+                    luts[n, entry] = tuple(stops[value][:3]) + (255,)
+            else:
+                luts[:, entry] = value
+
+        # Un solo accesso indicizzato produce le immagini di tutte le palette
+        # (np.take è molto più veloce dell'indicizzazione avanzata sull'asse centrale)
+        return np.take(luts, coverage['index'], axis=1)
+
+
+def render_palettes(variant, size, palettes):
+    """Immagini size x size di una variante, una per palette (parametri come in params.py)
+
+    La geometria viene calcolata una volta sola per tutte le palette.
+    """
+    if variant in ('adaptive_legacy', 'adaptive_round'):
+        layer_size = legacy_layer_size(size)
+        backgrounds = render_palettes('adaptive_background', layer_size, palettes)
+        foregrounds = render_palettes('adaptive_foreground', layer_size, palettes)
+        icons = []
+        for params, background, foreground in zip(palettes, backgrounds, foregrounds):
+            ratio = ROUND_RADIUS_RATIO if variant == 'adaptive_round' else params['logo']['radius_ratio']
+            icons.append(compose_legacy_icon(background, foreground, size, ratio))
+        return icons
+
+    group = VARIANT_PARAMS[variant]
+    pixels = colorize_coverage(COVERAGES[variant](size), [params[group]['colors'] for params in palettes])
+    if variant == 'adaptive_background':
+        return [Image.fromarray(array[..., :3]) for array in pixels]
+    if variant == 'adaptive_foreground':
+        return [Image.fromarray(array) for array in pixels]
+
+    images = []
+    for params, array in zip(palettes, pixels):
+        array[..., 3] = rounded_square_mask(size, params[group]['radius_ratio'])
+        images.append(Image.fromarray(array))
+    return images
+
+
+def load_palettes(path=PALETTES_PATH, base=None):
+    """Palette del file, come lista di {'name', 'params'}; i parametri partono da base"""
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f).get('palettes', [])
+    if not entries:
+        raise ValueError(f"Nessuna palette in {path}")
+
+    palettes = []
+    for entry in entries:
+        name = entry.get('name')
+        if not isinstance(name, str) or not PALETTE_NAME.match(name):
+            raise ValueError(f"Nome di palette non valido in {path}: {name!r} "
+                             "(solo lettere, cifre, '-' e '_')")
+        if any(palette['name'] == name for palette in palettes):
+            raise ValueError(f"Palette '{name}' ripetuta in {path}")
+        overrides = {group: values for group, values in entry.items() if group != 'name'}
+        palettes.append({'name': name, 'params': merge_params(overrides, f"{path} ({name})", base)})
+    return palettes
@@ -0,0 +1,89 @@
+"""
+Parametri di disegno modificabili senza toccare il codice: colori e raggio
+degli angoli del logo e dell'icona con gradiente
+
+Il file dei parametri (icon_params.json nella radice del repository) è
+facoltativo e contiene solo i valori da cambiare, per gruppo:
+
+    {
+        "logo": {"colors": [[139, 92, 246], [236, 72, 153]], "radius_ratio": 0.15},
+        "gradient": {"radius_ratio": 0.2}
+    }
+
+Il gruppo 'logo' vale per il logo e per i livelli Android, 'gradient' per
+l'icona con gradiente e per il fallback delle icone ricavate dal logo sorgente.
+"""
+
+import json
+import os
+
+from icon_tools.icons import GRADIENT_COLORS, ICON_RADIUS_RATIO
+from icon_tools.logo import LOGO_COLORS, LOGO_RADIUS_RATIO
+
+# File dei parametri predefinito nella radice del repository
+PARAMS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'icon_params.json')
+
+# Valori predefiniti di ogni gruppo
+DEFAULT_PARAMS = {
+    'logo': {'colors': LOGO_COLORS, 'radius_ratio': LOGO_RADIUS_RATIO},
+    'gradient': {'colors': GRADIENT_COLORS, 'radius_ratio': ICON_RADIUS_RATIO},
+}
+
+# Gruppo usato da ogni variante del manifest
+VARIANT_PARAMS = {
+    'logo': 'logo',
+    'gradient': 'gradient',
+    'source': 'gradient',
+    'adaptive_background': 'logo',
+    'adaptive_foreground': 'logo',
+    'adaptive_legacy': 'logo',
+    'adaptive_round': 'logo',
+}
+
+
+def _validate_colors(group, colors, channels):
+    """Controlla una lista di colori e la converte in tuple (utilizzabili come chiavi di cache)"""
+    if not isinstance(colors, list) or len(colors) < 2:
+        raise ValueError(f"{group}.colors deve essere una lista di almeno due colori")
+    for color in colors:
+        if (not isinstance(color, list) or len(color) != channels or
+                not all(isinstance(v, int) and 0 <= v <= 255 for v in color)):
+            raise ValueError(f"{group}.colors: colore non valido {color} "
+                             f"(attesi {channels} valori interi da 0 a 255)")
+    return tuple(tuple(color) for color in colors)
+
+
+def merge_params(overrides, where, base=None):
+    """Applica e valida le modifiche di un gruppo di parametri su base (predefinito: DEFAULT_PARAMS)
+
+    where identifica l'origine delle modifiche nei messaggi di errore.
+    """
+    params = {group: dict(values) for group, values in (base or DEFAULT_PARAMS).items()}
+    unknown = set(overrides) - set(params)
+    if unknown:
+        raise ValueError(f"Gruppi sconosciuti in {where}: {', '.join(sorted(unknown))}")
+
+    for group, values in overrides.items():
+        fields = set(values) - {'colors', 'radius_ratio'}
+        if fields:
+            raise ValueError(f"Campi sconosciuti per '{group}' in {where}: {', '.join(sorted(fields))}")
+        if 'colors' in values:
+            channels = len(DEFAULT_PARAMS[group]['colors'][0])
+            params[group]['colors'] = _validate_colors(group, values['colors'], channels)
+        if 'radius_ratio' in values:
+            ratio = values['radius_ratio']
+            if not isinstance(ratio, (int, float)) or not 0 <= ratio <= 0.5:
+                raise ValueError(f"{group}.radius_ratio deve essere un numero tra 0 e 0.5, non {ratio}")
+            params[group]['radius_ratio'] = ratio
+    return params
+
+
+def load_params(path=PARAMS_PATH):
+    """Parametri di disegno: i valori predefiniti con le modifiche del file, se esiste"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            overrides = json.load(f)
+    except FileNotFoundError:
+        return merge_params({}, path)
+    return merge_params(overrides, path)
@@ -0,0 +1,109 @@
+"""
+Pianificazione dei render: i target con la stessa dimensione in pixel e la
+stessa variante producono la stessa bitmap, quindi vengono renderizzati e
+codificati una sola volta e poi collegati a tutte le destinazioni
+"""
+
+import os
+import shutil
+
+from icon_tools.profiling import stage
+
+
+def target_pixels(target):
+    """Dimensione in pixel di un target (dimensione base per scala)"""
+    return int(target['size'] * target.get('scale', 1))
+
+
+def plan_jobs(targets):
+    """Raggruppa i target per (dimensione, variante) mantenendo l'ordine del manifest
+
+    Restituisce un dizionario con la lista dei job e le statistiche del piano.
+    Ogni job ha 'variant', 'size', 'targets' (tutte le voci del manifest che
+    produce) e 'paths' (le destinazioni uniche, la prima viene codificata).
+    """
+    jobs = {}
+    owners = {}
+
+    for target in targets:
+        key = (target_pixels(target), target['variant'])
+        path = target['path']
+
+        # Lo stesso file non può essere prodotto da due bitmap diverse
+        if path in owners and owners[path] != key:
+            raise ValueError(f"{path} è prodotto da due render diversi: {owners[path]} e {key}")
+        owners[path] = key
+
+        job = jobs.setdefault(key, {'size': key[0], 'variant': key[1], 'targets': [], 'paths': []})
+        job['targets'].append(target)
+        if path not in job['paths']:
+            job['paths'].append(path)
+
+    jobs = list(jobs.values())
+    files = sum(len(job['paths']) for job in jobs)
+    stats = {
+        'targets': len(targets),
+        'files': files,
+        'renders': len(jobs),
+        'saved_renders': len(targets) - len(jobs),
+        'links': files - len(jobs),
+    }
+    return {'jobs': jobs, 'stats': stats}
+
+
+def plan_containers(containers, jobs):
+    """Collega ogni contenitore (.ico, .icns) ai job che producono le sue dimensioni
+
+    Restituisce un job per contenitore con 'format', 'variant', 'size' (la
+    lista delle dimensioni), 'targets', 'paths' e 'sources': per ogni
+    dimensione il PNG già codificato da un job del piano, oppure None se la
+    dimensione non è prodotta da nessun job e va renderizzata a parte.
+    """
+    produced = {(job['size'], job['variant']): job['paths'][0] for job in jobs}
+    planned = []
+    for container in containers:
+        sizes = sorted(set(container['sizes']))
+        planned.append({
+            'format': container['format'],
+            'variant': container['variant'],
+            'size': sizes,
+            'targets': [container],
+            'paths': [container['path']],
+            'sources': {size: produced.get((size, container['variant'])) for size in sizes},
+        })
+    return planned
+
+
+def prepare_output(path):
+    """Crea la cartella di destinazione e scollega un eventuale hard link esistente
+
+    Senza questo passaggio, riscrivere un file collegato da una build
+    precedente modificherebbe anche tutti gli altri file dello stesso inode.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if os.path.exists(path) and os.stat(path).st_nlink > 1:
+        os.remove(path)
+
+
+def link_output(source, destination):
+    """Collega destination a source con un hard link, copiando se non è possibile"""
+    if os.path.abspath(source) == os.path.abspath(destination):
+        return
+    with stage('link'):
+        if os.path.lexists(destination):
+            os.remove(destination)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copyfile(source, destination)
+
+
+def print_plan_report(stats):
+    """Stampa quanto lavoro è stato risparmiato dal piano"""
+    print(f"\n♻️  {stats['targets']} target → {stats['renders']} render unici, "
+          f"{stats['files']} file ({stats['links']} collegati senza ricodifica)")
+    if stats['targets']:
+        saved = stats['saved_renders'] / stats['targets'] * 100
+        print(f"   Render e codifiche PNG evitati: {stats['saved_renders']} ({saved:.0f}%)")
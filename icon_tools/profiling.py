@@ -0,0 +1,132 @@
+"""
+Strumentazione delle fasi di generazione: tempo reale, tempo CPU e byte
+scritti per ogni fase e per ogni target
+
+Le funzioni di disegno racchiudono le proprie fasi in stage(); quando la
+strumentazione è disattivata (predefinito) stage() non registra nulla. I tempi
+sono inclusivi: una fase comprende le fasi annidate al suo interno.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+_enabled = False
+_records = []
+_current_target = None
+
+
+def enable(flag=True):
+    """Attiva (o disattiva) la registrazione delle fasi in questo processo"""
+    global _enabled
+    _enabled = flag
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Svuota il registro: ogni build (anche nel watch) riporta solo le proprie fasi"""
+    del _records[:]
+
+
+@contextmanager
+def target(name):
+    """Attribuisce al target name tutte le fasi registrate nel blocco"""
+    global _current_target
+    previous = _current_target
+    _current_target = name
+    try:
+        yield
+    finally:
+        _current_target = previous
+
+
+@contextmanager
+def stage(name):
+    """Misura una fase; il blocco può impostare record['bytes'] con i byte scritti"""
+    if not _enabled:
+        yield {}
+        return
+
+    record = {'stage': name, 'target': _current_target, 'pid': os.getpid(), 'bytes': 0}
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield record
+    finally:
+        record['start'] = start
+        record['wall'] = time.perf_counter() - start
+        record['cpu'] = time.process_time() - cpu_start
+        _records.append(record)
+
+
+def mark():
+    """Posizione attuale nel registro, da passare a take()"""
+    return len(_records)
+
+
+def take(position):
+    """Rimuove e restituisce le fasi registrate dopo position (per inviarle dai worker)"""
+    taken = _records[position:]
+    del _records[position:]
+    return taken
+
+
+def extend(records):
+    """Aggiunge al registro le fasi ricevute da un worker"""
+    _records.extend(records)
+
+
+def records():
+    return list(_records)
+
+
+def _aggregate(key):
+    totals = {}
+    for record in _records:
+        entry = totals.setdefault(record[key], {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'bytes': 0})
+        entry['calls'] += 1
+        entry['wall'] += record['wall']
+        entry['cpu'] += record['cpu']
+        entry['bytes'] += record['bytes']
+    return sorted(totals.items(), key=lambda item: item[1]['wall'], reverse=True)
+
+
+def print_summary(top_targets=10):
+    """Stampa la tabella delle fasi e dei target più lenti, ordinata per tempo reale"""
+    if not _records:
+        return
+
+    print("\n⏱️  Tempi per fase (inclusivi):")
+    print(f"   {'fase':<16} {'chiamate':>8} {'reale ms':>10} {'CPU ms':>10} {'byte':>10}")
+    for name, entry in _aggregate('stage'):
+        print(f"   {name:<16} {entry['calls']:>8} {entry['wall'] * 1000:>10.1f} "
+              f"{entry['cpu'] * 1000:>10.1f} {entry['bytes']:>10}")
+
+    targets = [(name, entry) for name, entry in _aggregate('target') if name is not None]
+    if targets:
+        print(f"\n⏱️  Target più lenti (primi {min(top_targets, len(targets))}):")
+        for name, entry in targets[:top_targets]:
+            print(f"   {entry['wall'] * 1000:>8.1f} ms  {name}")
+
+
+def write_chrome_trace(path):
+    """Scrive le fasi registrate in formato Chrome trace (chrome://tracing, Perfetto)"""
+    events = []
+    for record in _records:
+        events.append({
+            'name': record['stage'],
+            'cat': 'icons',
+            'ph': 'X',
+            'ts': record['start'] * 1e6,
+            'dur': record['wall'] * 1e6,
+            'pid': 0,
+            'tid': record['pid'],
+            'args': {'target': record['target'], 'cpu_ms': record['cpu'] * 1000,
+                     'bytes': record['bytes']},
+        })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
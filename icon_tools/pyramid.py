@@ -0,0 +1,55 @@
+"""
+Piramide di ridimensionamento: si renderizza una sola volta a risoluzione
+master e si ricavano tutte le dimensioni richieste dal livello più vicino
+
+I livelli sono array float32 in luce lineare con alpha premoltiplicato (vedi
+resample.py): il master viene convertito una volta sola e ogni icona torna in
+sRGB solo alla sua dimensione finale.
+"""
+
+from icon_tools.profiling import stage
+from icon_tools.resample import delinearize, linearize, reduce_half, resize_linear
+
+# Dimensione master predefinita per la modalità --master
+DEFAULT_MASTER_SIZE = 2048
+
+
+def build_pyramid(master, min_size=1):
+    """Converte l'immagine master in luce lineare e la dimezza ripetutamente con un filtro box
+
+    Restituisce la lista dei livelli, dal più grande al più piccolo; l'ultimo
+    livello non scende sotto min_size.
+    """
+    levels = [linearize(master)]
+    with stage('pyramid'):
+        while min(levels[-1].shape[:2]) // 2 >= min_size:
+            levels.append(reduce_half(levels[-1]))
+    return levels
+
+
+def pyramid_level(levels, size):
+    """Restituisce il livello più piccolo che sia almeno grande quanto size"""
+    source = levels[0]
+    for level in levels:
+        if min(level.shape[:2]) >= size:
+            source = level
+    return source
+
+
+def resize_from_pyramid(levels, size):
+    """Ricava un'icona size x size dal livello più vicino della piramide"""
+    source = pyramid_level(levels, size)
+    with stage('resize'):
+        pixels = resize_linear(source, size)
+    return delinearize(pixels)
+
+
+def render_from_master(render, sizes, master_size=DEFAULT_MASTER_SIZE):
+    """Renderizza una volta a master_size e restituisce un dizionario {dimensione: immagine}
+
+    render è la funzione di disegno (per esempio create_app_logo) e viene
+    chiamata una sola volta; le dimensioni ripetute vengono calcolate una volta.
+    """
+    master = render(master_size)
+    levels = build_pyramid(master, min_size=min(sizes))
+    return {size: resize_from_pyramid(levels, size) for size in sorted(set(sizes))}
@@ -0,0 +1,25 @@
+"""
+Immagini di avvio (LaunchImage iOS, launch_image Android): il logo al centro
+di un canvas a tutto schermo con il gradiente delle icone
+
+Il logo non viene ridisegnato: arriva già renderizzato dalla build (in
+modalità master dalla stessa piramide delle icone 'logo'), e lo sfondo è il
+gradiente vettorizzato di gradient.py, calcolato come una sola colonna e
+ripetuto su tutta la larghezza. Il canvas è più grande degli schermi comuni
+della piattaforma e viene mostrato centrato, quindi sugli schermi più piccoli
+i bordi vengono tagliati e il logo resta al centro senza deformarsi.
+"""
+
+from icon_tools.gradient import linear_gradient
+from icon_tools.profiling import stage
+
+# Gruppo di parametri (vedi params.py) da cui prendere i colori dello sfondo
+SPLASH_PARAMS = 'gradient'
+
+
+def render_splash(width, height, logo, colors):
+    """Canvas width x height opaco con il gradiente verticale di colors e logo al centro"""
+    canvas = linear_gradient(width, height, colors, direction='vertical').convert('RGBA')
+    with stage('composite'):
+        canvas.alpha_composite(logo, ((width - logo.width) // 2, (height - logo.height) // 2))
+    return canvas.convert('RGB')
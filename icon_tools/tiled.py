@@ -0,0 +1,81 @@
+"""
+Render a strisce per output molto grandi (banner per gli store, stampa)
+
+Invece di allocare sfondo, livelli delle forme, maschera e immagine finale a
+piena dimensione, l'immagine viene calcolata per strisce orizzontali che
+vanno direttamente all'encoder PNG; anche gli angoli della maschera sono
+calcolati solo per le righe della striscia. La memoria di picco resta sotto
+un tetto fisso qualunque sia la dimensione dell'output, e i pixel coincidono
+con quelli del render diretto.
+"""
+
+import io
+
+from icon_tools.icons import render_gradient_icon_rows
+from icon_tools.logo import render_app_logo_rows
+from icon_tools.png import DEFAULT_COMPRESS_LEVEL, write_png_rows
+from icon_tools.profiling import stage
+
+# Dimensione da cui la build passa al render a strisce
+TILED_MIN_SIZE = 8192
+
+# Tetto di memoria predefinito per le strisce (64 MiB)
+DEFAULT_TILE_MEMORY = 64 * 2**20
+
+# Memoria riservata a ciò che non cresce con la striscia: stato del compressore
+# zlib, rampe dei gradienti e riga precedente del filtro PNG
+TILE_RESERVED_MEMORY = 4 * 2**20
+
+# Byte di lavoro per pixel di una striscia, misurati con tracemalloc: righe RGBA,
+# righe filtrate e la loro copia per zlib, maschera, temporanei float64 degli
+# angoli e, per il logo, livello e temporanei delle forme
+TILE_BYTES_PER_PIXEL = {
+    'logo': 32,
+    'gradient': 16,
+}
+
+# Varianti che sanno calcolare solo una parte delle righe
+TILED_RENDERERS = {
+    'logo': render_app_logo_rows,
+    'gradient': render_gradient_icon_rows,
+}
+
+
+def strip_height(variant, width, max_memory=DEFAULT_TILE_MEMORY):
+    """Numero di righe per striscia che rispetta il tetto di memoria (almeno una)"""
+    budget = max(max_memory - TILE_RESERVED_MEMORY, 0)
+    return max(1, budget // (width * TILE_BYTES_PER_PIXEL[variant]))
+
+
+def iter_strips(variant, size, max_memory=DEFAULT_TILE_MEMORY, render_params=None):
+    """Genera le strisce RGBA di un'icona size x size, dall'alto in basso
+
+    render_params (colors, radius_ratio) sono passati alla funzione della variante.
+    """
+    render_rows = TILED_RENDERERS[variant]
+    rows = strip_height(variant, size, max_memory)
+    for top in range(0, size, rows):
+        yield render_rows(size, top, min(top + rows, size), **(render_params or {}))
+
+
+def write_tiled(variant, size, path, max_memory=DEFAULT_TILE_MEMORY, compress_level=DEFAULT_COMPRESS_LEVEL,
+                render_params=None):
+    """Renderizza e salva in path un'icona a strisce; restituisce le statistiche come write_png"""
+    with stage('tiled_render') as timing:
+        strips = iter_strips(variant, size, max_memory, render_params)
+        written = write_png_rows(path, size, size, strips, compress_level=compress_level)
+        timing['bytes'] = written
+    return {'bytes': written, 'saved': 0}
+
+
+def encode_tiled(variant, size, max_memory=DEFAULT_TILE_MEMORY, compress_level=DEFAULT_COMPRESS_LEVEL,
+                 render_params=None):
+    """Come write_tiled, ma restituisce i byte del PNG invece di scriverli su disco
+
+    Le strisce restano limitate dal tetto di memoria; in memoria resta solo il PNG compresso.
+    """
+    buffer = io.BytesIO()
+    with stage('tiled_render') as timing:
+        strips = iter_strips(variant, size, max_memory, render_params)
+        timing['bytes'] = write_png_rows(buffer, size, size, strips, compress_level=compress_level)
+    return buffer.getvalue()
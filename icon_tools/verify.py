@@ -0,0 +1,279 @@
+"""
+Verifica delle icone contro i PNG committati (golden image)
+
+Ogni target del manifest viene renderizzato in memoria, senza scrivere nulla,
+e confrontato con il file su disco con una differenza per pixel calcolata su
+tutto l'array. Lo stesso vale per ogni immagine dentro i contenitori (.ico,
+.icns); i file descrittivi (Contents.json, manifest web, adaptive icon)
+devono essere identici a quelli generati dal manifest e passare la loro
+validazione. La differenza è percettiva: i colori sono premoltiplicati per
+l'alpha (il colore dei pixel trasparenti non conta) e pesati come li vede
+l'occhio (distanza "redmean"), su scala 0-255. Un target fallisce se più di
+max_ratio dei suoi pixel supera la tolleranza; per ogni target fallito viene
+scritta un'immagine con riferimento, render e mappa delle differenze.
+"""
+
+import io
+import os
+from functools import partial
+
+import numpy as np
+from PIL import Image
+
+from icon_tools import profiling
+from icon_tools.build import (
+    PLATFORM_TITLES,
+    is_tiled,
+    job_source,
+    render_job,
+    render_splash_entry,
+    splash_member,
+    variant_min_sizes,
+)
+from icon_tools.containers import CONTAINER_READERS
+from icon_tools.metadata import METADATA_FORMATS
+from icon_tools.params import VARIANT_PARAMS, load_params
+from icon_tools.planner import plan_containers, plan_jobs
+from icon_tools.tiled import iter_strips
+
+# Differenza percettiva massima accettata per pixel (0-255): assorbe gli
+# arrotondamenti di ridimensionamento e anti-aliasing
+DEFAULT_TOLERANCE = 8
+
+# Frazione di pixel che può superare la tolleranza
+DEFAULT_MAX_RATIO = 0.001
+
+# Cartella del report, scritta solo se qualche target fallisce
+REPORT_DIR = 'icon_verify_report'
+
+
+def perceptual_delta(expected, actual):
+    """Differenza per pixel tra due array RGBA uint8 della stessa forma, su scala 0-255"""
+    expected = expected.astype(np.float32)
+    actual = actual.astype(np.float32)
+    expected_alpha = expected[..., 3:] / 255
+    actual_alpha = actual[..., 3:] / 255
+
+    expected_rgb = expected[..., :3] * expected_alpha
+    actual_rgb = actual[..., :3] * actual_alpha
+    dr, dg, db = np.moveaxis(expected_rgb - actual_rgb, -1, 0)
+
+    # Distanza "redmean": il peso di rosso e blu dipende dal rosso medio
+    red = (expected_rgb[..., 0] + actual_rgb[..., 0]) / 2
+    color = np.sqrt((2 + red / 256) * dr * dr + 4 * dg * dg + (2 + (255 - red) / 256) * db * db) / 3
+    return np.maximum(color, np.abs(expected[..., 3] - actual[..., 3]))
+
+
+def _load_reference(path):
+    """Pixel RGBA di un file di riferimento, oppure None se manca"""
+    try:
+        with Image.open(path) as image:
+            return np.asarray(image.convert('RGBA'))
+    except FileNotFoundError:
+        return None
+
+
+def _decode_payload(data):
+    """Pixel RGBA di un PNG in memoria (un'immagine di un contenitore)"""
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert('RGBA'))
+
+
+def _read_container(path, container_format):
+    """Immagini di un contenitore su disco come {dimensione: pixel RGBA}, oppure None se manca"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    payloads = CONTAINER_READERS[container_format](data)
+    return {size: _decode_payload(payload) for size, payload in payloads.items()}
+
+
+def _checkerboard(size, cell=8):
+    """Scacchiera grigia su cui mostrare la trasparenza nel report"""
+    ys, xs = np.indices(size[::-1])
+    light = ((xs // cell + ys // cell) % 2 == 0)
+    board = np.where(light, 230, 200).astype(np.uint8)
+    return Image.fromarray(np.stack([board] * 3 + [np.full_like(board, 255)], axis=-1))
+
+
+def _write_report(path, expected, actual, delta, tolerance, report_dir):
+    """Salva riferimento, render e mappa delle differenze affiancati; restituisce il percorso"""
+    height, width = expected.shape[:2]
+    # Differenze sotto la tolleranza in arancio tenue, sopra in rosso pieno
+    heat = np.zeros((height, width, 4), dtype=np.uint8)
+    heat[..., 0] = 255
+    heat[..., 1] = np.where(delta > tolerance, 0, 160)
+    heat[..., 3] = np.where(delta > tolerance, 255, np.clip(delta * 255 / max(tolerance, 1), 0, 255))
+
+    sheet = Image.new('RGBA', (width * 3, height))
+    for i, panel in enumerate((expected, actual, heat)):
+        tile = _checkerboard((width, height))
+        tile.alpha_composite(Image.fromarray(panel))
+        sheet.paste(tile, (i * width, 0))
+
+    name = path.replace('/', '__').replace('#', '_')
+    # Le immagini dei contenitori (app_icon.ico#16) vengono salvate come PNG
+    report = os.path.join(report_dir, name if name.endswith('.png') else name + '.png')
+    os.makedirs(report_dir, exist_ok=True)
+    sheet.save(report)
+    return report
+
+
+def _compare_tiled(job, variant, render_params, reference, tolerance):
+    """Confronta a strisce un target renderizzato a strisce; restituisce (massimo, pixel fuori)"""
+    worst = 0.0
+    over = 0
+    top = 0
+    for rows in iter_strips(variant, job['size'], render_params=render_params):
+        delta = perceptual_delta(reference[top:top + len(rows)], rows)
+        worst = max(worst, float(delta.max()))
+        over += int(np.count_nonzero(delta > tolerance))
+        top += len(rows)
+    return worst, over
+
+
+def verify(manifest, master_size=None, params=None, tolerance=DEFAULT_TOLERANCE,
+           max_ratio=DEFAULT_MAX_RATIO, report_dir=REPORT_DIR):
+    """Confronta target, contenitori, immagini di avvio e file descrittivi del manifest con i file committati
+
+    Restituisce True se tutti passano. I file senza riferimento vengono
+    segnalati ma non fanno fallire la verifica. Con master_size le icone sono
+    ricavate dal render master come nella build; senza, ogni target viene
+    disegnato alla sua dimensione. Le immagini dei contenitori vengono
+    confrontate una per una (nel report come percorso#dimensione).
+    """
+    if params is None:
+        params = load_params()
+    plan = plan_jobs(manifest['targets'])
+    containers = plan_containers(manifest.get('containers', []), plan['jobs'])
+
+    min_sizes = variant_min_sizes(plan['jobs'], containers, manifest.get('splash', []))
+    pyramids = {}
+
+    failures = []
+    checked = 0
+    missing = 0
+
+    def check(path, shape, actual, reference=None):
+        """Confronta un file con actual (array RGBA, o funzione di confronto a strisce)
+
+        reference sono i pixel di riferimento già letti; senza, viene letto il file path.
+        """
+        nonlocal checked, missing
+        height, width = shape
+        if reference is None:
+            reference = _load_reference(path)
+        if reference is None:
+            missing += 1
+            print(f"  ⚠️  {path} (nessun riferimento su disco)")
+            return
+        checked += 1
+        if reference.shape[:2] != shape:
+            failures.append(path)
+            print(f"  ❌ {path} (riferimento {reference.shape[1]}x{reference.shape[0]}, "
+                  f"attesi {width}x{height})")
+            return
+
+        with profiling.stage('compare'):
+            if callable(actual):
+                worst, over = actual(reference, tolerance)
+                delta = None
+            else:
+                delta = perceptual_delta(reference, actual)
+                worst = float(delta.max())
+                over = int(np.count_nonzero(delta > tolerance))
+
+        ratio = over / (width * height)
+        if ratio <= max_ratio:
+            print(f"  ✅ {path} ({width}x{height}, differenza massima {worst:.1f})")
+            return
+
+        failures.append(path)
+        detail = f"{over} pixel oltre {tolerance} ({ratio:.2%}), differenza massima {worst:.1f}"
+        if delta is not None:
+            report = _write_report(path, reference, actual, delta, tolerance, report_dir)
+            detail += f", report in {report}"
+        print(f"  ❌ {path} ({detail})")
+
+    platform = None
+    for job in plan['jobs']:
+        if job['targets'][0]['platform'] != platform:
+            platform = job['targets'][0]['platform']
+            print(PLATFORM_TITLES[platform])
+
+        size = job['size']
+        # Le piramidi sono nuove a ogni verifica: basta una chiave costante
+        level, variant = job_source(job, job['variant'], master_size, params, pyramids,
+                                    min_sizes[job['variant']], master_size)
+        render_params = params[VARIANT_PARAMS[variant]]
+        tiled = level is None and is_tiled(job, variant)
+        actual = None if tiled else np.asarray(render_job(job, level, variant, render_params).convert('RGBA'))
+
+        compare = partial(_compare_tiled, job, variant, render_params) if tiled else actual
+        for path in job['paths']:
+            check(path, (size, size), compare)
+
+    for entry in manifest.get('splash', []):
+        if entry['platform'] != platform:
+            platform = entry['platform']
+            print(PLATFORM_TITLES[platform])
+        level, variant = job_source(splash_member(entry), 'logo', master_size, params, pyramids,
+                                    min_sizes['logo'], master_size)
+        actual = np.asarray(render_splash_entry(entry, level, variant, params).convert('RGBA'))
+        check(entry['path'], (entry['height'], entry['width']), actual)
+
+    for container in containers:
+        if container['targets'][0]['platform'] != platform:
+            platform = container['targets'][0]['platform']
+            print(PLATFORM_TITLES[platform])
+
+        path = container['paths'][0]
+        images = _read_container(path, container['format'])
+        if images is None:
+            missing += 1
+            print(f"  ⚠️  {path} (nessun riferimento su disco)")
+            continue
+        if sorted(images) != container['size']:
+            checked += 1
+            failures.append(path)
+            print(f"  ❌ {path} (dimensioni {', '.join(map(str, sorted(images)))}, "
+                  f"attese {', '.join(map(str, container['size']))})")
+            continue
+
+        for size in container['size']:
+            member = {'size': size, 'variant': container['variant']}
+            level, variant = job_source(member, container['variant'], master_size, params, pyramids,
+                                        min_sizes[container['variant']], master_size)
+            image = render_job(member, level, variant, params[VARIANT_PARAMS[variant]])
+            check(f"{path}#{size}", (size, size), np.asarray(image.convert('RGBA')), reference=images[size])
+
+    for entry in manifest.get('metadata', []):
+        if entry['platform'] != platform:
+            platform = entry['platform']
+            print(PLATFORM_TITLES[platform])
+
+        generate, validate = METADATA_FORMATS[entry['format']]
+        try:
+            with open(entry['path'], encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            missing += 1
+            print(f"  ⚠️  {entry['path']} (nessun riferimento su disco)")
+            continue
+        checked += 1
+        if content != generate(entry, manifest['targets']):
+            failures.append(entry['path'])
+            print(f"  ❌ {entry['path']} (diverso da quello generato dal manifest)")
+            continue
+        problems = validate(entry, manifest['targets'])
+        if problems:
+            failures.append(entry['path'])
+            print(f"  ❌ {entry['path']} ({'; '.join(problems)})")
+            continue
+        print(f"  ✅ {entry['path']} (uguale al manifest)")
+
+    print(f"\n🔍 Verificati {checked} file: {checked - len(failures)} uguali, {len(failures)} diversi"
+          + (f", {missing} senza riferimento" if missing else ""))
+    return not failures
@@ -0,0 +1,68 @@
+"""
+Modalità watch: la build viene rieseguita nello stesso processo ogni volta che
+cambiano il logo sorgente, il file dei parametri o il manifest
+
+Restando nello stesso processo, maschere, livelli Android, logo sorgente
+decodificato e piramidi dei master rimangono in memoria tra una build e
+l'altra; la cache della build fa sì che vengano renderizzati e scritti solo i
+target che dipendono da ciò che è cambiato. Le modifiche al codice di
+icon_tools richiedono invece di riavviare il watch.
+"""
+
+import os
+import time
+
+# Intervallo predefinito tra due controlli dei file, in secondi
+DEFAULT_INTERVAL = 0.5
+
+
+def snapshot(paths):
+    """Data di modifica e dimensione di ogni file (None se non esiste)"""
+    state = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            state[path] = None
+    return state
+
+
+def _run(rebuild):
+    """Esegue una build; gli errori di input vengono stampati senza fermare il watch"""
+    try:
+        rebuild()
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Build non riuscita: {e}")
+
+
+def watch(paths, rebuild, interval=DEFAULT_INTERVAL):
+    """Esegue rebuild() e poi di nuovo a ogni modifica di paths, fino a Ctrl+C"""
+    _run(rebuild)
+    # Lo stato viene letto dopo la build, che può riscrivere essa stessa un
+    # file osservato (il logo sorgente è anche un output del logo)
+    state = snapshot(paths)
+    print(f"\n👀 In attesa di modifiche a {', '.join(paths)} (Ctrl+C per uscire)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(paths)
+            if current == state:
+                continue
+
+            # Gli editor salvano spesso in più scritture: si aspetta che il file sia stabile
+            while True:
+                time.sleep(interval)
+                settled = snapshot(paths)
+                if settled == current:
+                    break
+                current = settled
+
+            changed = [path for path in paths if current[path] != state[path]]
+            print(f"\n🔄 Modificati: {', '.join(changed)}")
+            _run(rebuild)
+            state = snapshot(paths)
+            print("\n👀 In attesa di modifiche (Ctrl+C per uscire)")
+    except KeyboardInterrupt:
+        print("\n👋 Watch terminato")